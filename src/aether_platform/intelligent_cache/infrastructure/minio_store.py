@@ -14,7 +14,10 @@ class _QueueStream(io.RawIOBase):
 
     def __init__(self, q: queue_mod.Queue):
         self._queue = q
-        self._buf = b""
+        # Current chunk and read offset; consumed via memoryview so partial
+        # reads never copy the unread remainder
+        self._buf = memoryview(b"")
+        self._pos = 0
         self._eof = False
 
     def readable(self):
@@ -23,15 +26,16 @@ class _QueueStream(io.RawIOBase):
     def readinto(self, b):
         if self._eof:
             return 0
-        while not self._buf:
+        while self._pos >= len(self._buf):
             chunk = self._queue.get()
             if chunk is None:
                 self._eof = True
                 return 0
-            self._buf = chunk
-        n = min(len(b), len(self._buf))
-        b[:n] = self._buf[:n]
-        self._buf = self._buf[n:]
+            self._buf = memoryview(chunk)
+            self._pos = 0
+        n = min(len(b), len(self._buf) - self._pos)
+        b[:n] = self._buf[self._pos : self._pos + n]
+        self._pos += n
         return n
 
 
@@ -0,0 +1,16 @@
+"""Event loop runner; uses uvloop when available."""
+
+import asyncio
+from typing import Any, Coroutine
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+
+def run(main: Coroutine) -> Any:
+    """Like asyncio.run, but on a libuv-backed loop when uvloop is installed."""
+    loop_factory = uvloop.new_event_loop if uvloop is not None else None
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        return runner.run(main)
@@ -24,11 +24,13 @@ class RedisClient(Protocol):
 
     async def expire(self, key: str, time: int) -> bool: ...
 
+    def pipeline(self, transaction: bool = True) -> Any: ...
+
 
 class DataProvider(abc.ABC):
     @abc.abstractmethod
-    def get_chunks(self) -> AsyncIterator[bytes]:
-        """Returns an async iterator of binary chunks."""
+    def get_chunks(self) -> AsyncIterator[bytes | memoryview]:
+        """Returns an async iterator of binary chunks (bytes-like)."""
         pass
 
     @abc.abstractmethod
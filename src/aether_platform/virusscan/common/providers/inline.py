@@ -1,19 +1,33 @@
-from typing import AsyncIterator, Optional
+from typing import AsyncIterator, List, Optional
 
 from .base import DataProvider
 
 
 class InlineStreamProvider(DataProvider):
-    def __init__(self, data: bytes = b""):
-        self.data = data
+    # Larger chunks mean fewer INSTREAM frames per scan
+    CHUNK_SIZE = 64 * 1024
 
-    async def get_chunks(self) -> AsyncIterator[bytes]:
-        chunk_size = 4096
-        for i in range(0, len(self.data), chunk_size):
-            yield self.data[i : i + chunk_size]
+    def __init__(self, data: bytes = b""):
+        # Pushed chunks are collected and joined once on read, instead of
+        # `data += chunk` copying the whole body again on every push
+        self._parts: List[bytes] = [data] if data else []
+
+    @property
+    def data(self) -> bytes:
+        if len(self._parts) > 1:
+            self._parts = [b"".join(self._parts)]
+        return self._parts[0] if self._parts else b""
+
+    async def get_chunks(self) -> AsyncIterator[memoryview]:
+        # Slicing a memoryview references the buffer instead of copying it;
+        # the stream writer hands the views to the socket as-is
+        view = memoryview(self.data)
+        chunk_size = self.CHUNK_SIZE
+        for i in range(0, len(view), chunk_size):
+            yield view[i : i + chunk_size]
 
     async def push_chunk(self, chunk: bytes):
-        self.data += chunk
+        self._parts.append(chunk)
 
     async def finalize_push(self):
         pass
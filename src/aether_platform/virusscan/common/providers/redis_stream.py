@@ -1,14 +1,35 @@
-from typing import AsyncIterator, Optional
+import asyncio
+from typing import AsyncIterator, List, Optional
 
 from .base import DataProvider, RedisClient
 
 
 class RedisStreamProvider(DataProvider):
-    def __init__(self, redis_client: RedisClient, chunks_key: str):
+    def __init__(
+        self,
+        redis_client: RedisClient,
+        chunks_key: str,
+        batch_bytes: int = 64 * 1024,
+        batch_chunks: int = 32,
+    ):
         self.redis = redis_client
         self.chunks_key = chunks_key
         self.verified_key = f"{chunks_key}:verified"
         self.done_key = f"{chunks_key}:done"
+        # Producer side: chunks are buffered and sent as one multi-value RPUSH
+        # once either threshold is reached (0 sends every chunk immediately)
+        self.batch_bytes = batch_bytes
+        self.batch_chunks = batch_chunks
+        self._pending: List[bytes] = []
+        self._pending_bytes = 0
+        # Serializes flushes so batches land in order (push_chunk runs as tasks)
+        self._flush_lock = asyncio.Lock()
+
+    def _take_pending(self) -> List[bytes]:
+        pending = self._pending
+        self._pending = []
+        self._pending_bytes = 0
+        return pending
 
     async def get_chunks(self) -> AsyncIterator[bytes]:
         await self.redis.delete(self.verified_key)
@@ -24,10 +45,25 @@ class RedisStreamProvider(DataProvider):
             yield chunk
 
     async def push_chunk(self, chunk: bytes):
-        await self.redis.rpush(self.chunks_key, chunk)
+        self._pending.append(chunk)
+        self._pending_bytes += len(chunk)
+        if (
+            self._pending_bytes < self.batch_bytes
+            and len(self._pending) < self.batch_chunks
+        ):
+            return
+        batch = self._take_pending()
+        async with self._flush_lock:
+            await self.redis.rpush(self.chunks_key, *batch)
 
     async def finalize_push(self):
-        await self.redis.set(self.done_key, "1")
+        # Remaining chunks and the done marker go out in one round-trip
+        async with self._flush_lock:
+            pipe = self.redis.pipeline(transaction=False)
+            if self._pending:
+                pipe.rpush(self.chunks_key, *self._take_pending())
+            pipe.set(self.done_key, "1")
+            await pipe.execute()
 
     async def finalize(self, success: bool, is_virus: bool):
         if not success or is_virus:
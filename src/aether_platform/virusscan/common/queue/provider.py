@@ -1,5 +1,10 @@
+import logging
+import os
+import time
 from abc import ABC, abstractmethod
-from typing import Any, List, Optional, Set, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+logger = logging.getLogger(__name__)
 
 
 class QueueProvider(ABC):
@@ -20,10 +25,43 @@ class QueueProvider(ABC):
         """Blocks until a message is available from one of the queues."""
         pass
 
+    async def pop_batch(
+        self, queue_names: List[str], count: int, timeout: int = 0
+    ) -> List[Tuple[str, bytes]]:
+        """
+        Blocks until a message is available, then takes up to ``count - 1``
+        further messages that are already queued without blocking again.
+        Default falls back to a single pop for backends without batching.
+        """
+        result = await self.pop(queue_names, timeout=timeout)
+        return [result] if result else []
+
+    async def ack(self, queue_name: str, payload: bytes):
+        """
+        Confirms that a popped message has been processed. Default no-op for
+        backends where popping already removes the message for good.
+        """
+        return None
+
     async def expire(self, key: str, seconds: int) -> bool:
         """Sets a TTL on a key. Default no-op for backends without expiry."""
         return True
 
+    async def push_with_ttl(self, queue_name: str, payload: bytes | str, ttl: int):
+        """
+        Pushes a message and (re)sets the queue's TTL. Default issues the two
+        calls separately; backends with pipelining send them together.
+        """
+        await self.push(queue_name, payload)
+        await self.expire(queue_name, ttl)
+
+    async def publish(self, channel: str, message: bytes | str) -> Optional[bytes]:
+        """
+        Broadcasts a message to every reader of ``channel``; readers never
+        consume it for each other. Default no-op.
+        """
+        return None
+
 
 class StateStoreProvider(ABC):
     """
@@ -33,28 +71,28 @@ class StateStoreProvider(ABC):
 
     @abstractmethod
     async def set(
-        self, key: str, value: bytes | str, ex: int = None, nx: bool = False
+        self, key: str | bytes, value: bytes | str, ex: int = None, nx: bool = False
     ) -> bool | None:
         """Sets a key-value pair with an optional expiration and NX flag."""
         pass
 
     @abstractmethod
-    async def get(self, key: str) -> Optional[bytes]:
+    async def get(self, key: str | bytes) -> Optional[bytes]:
         """Retrieves the value for a given key."""
         pass
 
     @abstractmethod
-    async def mget(self, *keys: str) -> List[Optional[bytes]]:
+    async def mget(self, *keys: str | bytes) -> List[Optional[bytes]]:
         """Retrieves values for multiple keys."""
         pass
 
     @abstractmethod
-    async def exists(self, key: str) -> bool:
+    async def exists(self, key: str | bytes) -> bool:
         """Checks if a key exists."""
         pass
 
     @abstractmethod
-    async def delete(self, key: str):
+    async def delete(self, key: str | bytes):
         """Deletes a key-value pair."""
         pass
 
@@ -73,12 +111,23 @@ class StateStoreProvider(ABC):
         """Retrieves all members of a set."""
         pass
 
+    @abstractmethod
+    def pipeline(self) -> Any:
+        """
+        Returns a non-transactional pipeline that buffers commands and sends
+        them in a single round-trip on ``await pipe.execute()``.
+        """
+        pass
+
 
 class RedisQueueProvider(QueueProvider):
     """
     Redis implementation of the QueueProvider.
     """
 
+    # Broadcast streams keep roughly this many recent entries
+    BROADCAST_MAXLEN = 10000
+
     def __init__(self, redis_client: Any):
         self.redis = redis_client
 
@@ -94,9 +143,290 @@ class RedisQueueProvider(QueueProvider):
             return res[0].decode("utf-8"), res[1]
         return None
 
+    async def pop_batch(
+        self, queue_names: List[str], count: int, timeout: int = 0
+    ) -> List[Tuple[str, bytes]]:
+        if count <= 1:
+            result = await self.pop(queue_names, timeout=timeout)
+            return [result] if result else []
+
+        # BRPOP and a non-blocking LMPOP share one round-trip: Redis runs the
+        # LMPOP as soon as BRPOP returns, so a hot queue drains `count` tasks
+        # per RTT while a cold queue costs nothing extra.
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.brpop(queue_names, timeout=timeout)
+        pipe.lmpop(len(queue_names), *queue_names, direction="RIGHT", count=count - 1)
+        first, rest = await pipe.execute()
+
+        batch = []
+        if first:
+            batch.append((first[0].decode("utf-8"), first[1]))
+        if rest:
+            # LMPOP can still find work that arrived right after BRPOP timed out
+            queue_name = rest[0].decode("utf-8")
+            batch.extend((queue_name, payload) for payload in rest[1])
+        return batch
+
     async def expire(self, key: str, seconds: int) -> bool:
         return await self.redis.expire(key, seconds)
 
+    async def push_with_ttl(self, queue_name: str, payload: bytes | str, ttl: int):
+        # LPUSH + EXPIRE in one round-trip
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.lpush(queue_name, payload)
+        pipe.expire(queue_name, ttl)
+        await pipe.execute()
+
+    async def publish(self, channel: str, message: bytes | str) -> Optional[bytes]:
+        # A capped Stream rather than Pub/Sub: readers batch entries per XREAD
+        # and resume from their last ID after a reconnect
+        return await self.redis.xadd(
+            channel,
+            {"m": message},
+            maxlen=self.BROADCAST_MAXLEN,
+            approximate=True,
+        )
+
+
+class RedisSortedSetQueueProvider(RedisQueueProvider):
+    """
+    Redis implementation that keeps the scan task queues in a single sorted set.
+    The score orders by queue rank first, then by enqueue time, so one BZMPOP
+    over one key replaces a multi-key BRPOP and always yields priority work
+    first. Keys outside ``task_queues`` (ACK/result channels) stay plain lists.
+    """
+
+    # Rank stride in the score; leaves room for epoch milliseconds per rank
+    RANK_STRIDE = 10**13
+
+    def __init__(
+        self,
+        redis_client: Any,
+        key: str = "scan_tasks",
+        task_queues: Sequence[str] = ("scan_priority", "scan_normal"),
+    ):
+        super().__init__(redis_client)
+        self.key = key
+        self.task_queues = list(task_queues)
+        self._ranks = {name: rank for rank, name in enumerate(self.task_queues)}
+
+    def _is_task_pop(self, queue_names: List[str]) -> bool:
+        return all(name in self._ranks for name in queue_names)
+
+    def _queue_for_score(self, score: bytes | float) -> str:
+        rank = min(int(float(score) // self.RANK_STRIDE), len(self.task_queues) - 1)
+        return self.task_queues[rank]
+
+    async def push(self, queue_name: str, payload: bytes | str):
+        rank = self._ranks.get(queue_name)
+        if rank is None:
+            await super().push(queue_name, payload)
+            return
+        score = rank * self.RANK_STRIDE + time.time() * 1000
+        await self.redis.zadd(self.key, {payload: score})
+
+    async def push_with_ttl(self, queue_name: str, payload: bytes | str, ttl: int):
+        if queue_name in self._ranks:
+            # Task queues share one sorted set; never expire it for one push
+            await self.push(queue_name, payload)
+            return
+        await super().push_with_ttl(queue_name, payload, ttl)
+
+    async def pop(
+        self, queue_names: List[str], timeout: int = 0
+    ) -> Optional[Tuple[str, bytes]]:
+        if not self._is_task_pop(queue_names):
+            return await super().pop(queue_names, timeout=timeout)
+        batch = await self.pop_batch(queue_names, count=1, timeout=timeout)
+        return batch[0] if batch else None
+
+    async def pop_batch(
+        self, queue_names: List[str], count: int, timeout: int = 0
+    ) -> List[Tuple[str, bytes]]:
+        if not self._is_task_pop(queue_names):
+            return await super().pop_batch(queue_names, count, timeout=timeout)
+
+        res = await self.redis.bzmpop(timeout, 1, [self.key], min=True, count=count)
+        if not res:
+            return []
+        # bzmpop returns (key, [(member, score), ...])
+        return [(self._queue_for_score(score), member) for member, score in res[1]]
+
+
+class RedisStreamQueueProvider(RedisQueueProvider):
+    """
+    Redis implementation that keeps each scan task queue in a Stream read
+    through a consumer group. Streams are read in priority order, each read
+    asking only for what the batch still lacks, so a pop never returns more
+    than ``count`` tasks; a task stays in the group's pending list until
+    ``ack`` confirms it. Keys outside ``task_queues`` (ACK/result channels)
+    stay plain lists.
+    """
+
+    # Pending entries idle this long belong to a dead consumer and are
+    # re-delivered to the next one that polls. Kept above the producer's
+    # longest result wait, so slow scans of live consumers are not repeated.
+    STALE_IDLE_MS = 330_000
+    STALE_CHECK_INTERVAL = 30.0
+
+    def __init__(
+        self,
+        redis_client: Any,
+        group: str = "scanners",
+        consumer: Optional[str] = None,
+        task_queues: Sequence[str] = ("scan_priority", "scan_normal"),
+        key_suffix: str = ":stream",
+    ):
+        super().__init__(redis_client)
+        self.group = group
+        pod_name = os.getenv("HOSTNAME", "unknown-pod")
+        self.consumer = consumer or f"{pod_name}-{os.getpid()}"
+        self.task_queues = list(task_queues)
+        self._keys = {name: f"{name}{key_suffix}" for name in self.task_queues}
+        self._queues = {key: name for name, key in self._keys.items()}
+        self._groups_ready: Set[str] = set()
+        # (queue_name, payload) -> stream entry ID awaiting XACK
+        self._pending: Dict[Tuple[str, bytes], bytes] = {}
+        self._last_stale_check = 0.0
+
+    def _is_task_pop(self, queue_names: List[str]) -> bool:
+        return all(name in self._keys for name in queue_names)
+
+    async def _ensure_group(self, key: str):
+        if key in self._groups_ready:
+            return
+        try:
+            # Start at 0 so tasks pushed before the first consumer are not lost
+            await self.redis.xgroup_create(key, self.group, id="0", mkstream=True)
+        except Exception as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self._groups_ready.add(key)
+
+    def _take(self, queue_name: str, entries) -> List[Tuple[str, bytes]]:
+        """Records entries as pending for ``ack`` and returns them as tasks."""
+        batch = []
+        for entry_id, fields in entries:
+            payload = fields[b"d"]
+            self._pending[(queue_name, payload)] = entry_id
+            batch.append((queue_name, payload))
+        return batch
+
+    async def _reclaim_stale(
+        self, keys: List[str], count: int
+    ) -> List[Tuple[str, bytes]]:
+        """Claims up to ``count`` long-idle entries of dead consumers for this one."""
+        now = time.monotonic()
+        if now - self._last_stale_check < self.STALE_CHECK_INTERVAL:
+            return []
+        self._last_stale_check = now
+        batch = []
+        for key in keys:
+            if len(batch) >= count:
+                # More may be waiting; look again on the next poll
+                self._last_stale_check = 0.0
+                break
+            _, claimed, *_ = await self.redis.xautoclaim(
+                key,
+                self.group,
+                self.consumer,
+                self.STALE_IDLE_MS,
+                count=count - len(batch),
+            )
+            # Entries deleted from the stream since delivery come back empty
+            gone = [entry_id for entry_id, fields in claimed if not fields]
+            if gone:
+                await self.redis.xack(key, self.group, *gone)
+            live = [(entry_id, fields) for entry_id, fields in claimed if fields]
+            if live:
+                logger.warning(f"Re-dispatching {len(live)} stale task(s) from {key}")
+                batch.extend(self._take(self._queues[key], live))
+        return batch
+
+    async def _requeue(self, tasks: List[Tuple[str, bytes]]):
+        """Hands read-but-unwanted tasks back to the group as fresh entries."""
+        pipe = self.redis.pipeline(transaction=False)
+        for queue_name, payload in tasks:
+            key = self._keys[queue_name]
+            entry_id = self._pending.pop((queue_name, payload), None)
+            pipe.xadd(key, {"d": payload})
+            if entry_id is not None:
+                pipe.xack(key, self.group, entry_id)
+                pipe.xdel(key, entry_id)
+        await pipe.execute()
+
+    async def push(self, queue_name: str, payload: bytes | str):
+        key = self._keys.get(queue_name)
+        if key is None:
+            await super().push(queue_name, payload)
+            return
+        await self.redis.xadd(key, {"d": payload})
+
+    async def push_with_ttl(self, queue_name: str, payload: bytes | str, ttl: int):
+        if queue_name in self._keys:
+            # Task streams are long-lived; never expire them for one push
+            await self.push(queue_name, payload)
+            return
+        await super().push_with_ttl(queue_name, payload, ttl)
+
+    async def pop(
+        self, queue_names: List[str], timeout: int = 0
+    ) -> Optional[Tuple[str, bytes]]:
+        if not self._is_task_pop(queue_names):
+            return await super().pop(queue_names, timeout=timeout)
+        batch = await self.pop_batch(queue_names, count=1, timeout=timeout)
+        return batch[0] if batch else None
+
+    async def pop_batch(
+        self, queue_names: List[str], count: int, timeout: int = 0
+    ) -> List[Tuple[str, bytes]]:
+        if not self._is_task_pop(queue_names):
+            return await super().pop_batch(queue_names, count, timeout=timeout)
+
+        keys = [self._keys[name] for name in queue_names]
+        for key in keys:
+            await self._ensure_group(key)
+        batch = await self._reclaim_stale(keys, count)
+
+        # Queued work is taken without blocking, highest priority first
+        for key, queue_name in zip(keys, queue_names):
+            if len(batch) >= count:
+                return batch
+            streams = await self.redis.xreadgroup(
+                self.group, self.consumer, {key: ">"}, count=count - len(batch)
+            )
+            for _, entries in streams or ():
+                batch.extend(self._take(queue_name, entries))
+        if batch:
+            return batch
+
+        # Every stream is empty: block on all of them for the next task
+        streams = await self.redis.xreadgroup(
+            self.group,
+            self.consumer,
+            {key: ">" for key in keys},
+            count=1,
+            block=timeout * 1000,
+        )
+        for key, entries in streams or ():
+            batch.extend(self._take(self._queues[key.decode("utf-8")], entries))
+        if len(batch) > count:
+            # Tasks landing on several streams at once come back one per stream
+            await self._requeue(batch[count:])
+            del batch[count:]
+        return batch
+
+    async def ack(self, queue_name: str, payload: bytes):
+        entry_id = self._pending.pop((queue_name, payload), None)
+        if entry_id is None:
+            return
+        # XACK + XDEL in one round-trip keeps both the PEL and the stream small
+        key = self._keys[queue_name]
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.xack(key, self.group, entry_id)
+        pipe.xdel(key, entry_id)
+        await pipe.execute()
+
 
 class RedisStateStoreProvider(StateStoreProvider):
     """
@@ -107,22 +437,22 @@ class RedisStateStoreProvider(StateStoreProvider):
         self.redis = redis_client
 
     async def set(
-        self, key: str, value: bytes | str, ex: int = None, nx: bool = False
+        self, key: str | bytes, value: bytes | str, ex: int = None, nx: bool = False
     ) -> bool | None:
         return await self.redis.set(key, value, ex=ex, nx=nx)
 
-    async def get(self, key: str) -> Optional[bytes]:
+    async def get(self, key: str | bytes) -> Optional[bytes]:
         return await self.redis.get(key)
 
-    async def mget(self, *keys: str) -> List[Optional[bytes]]:
+    async def mget(self, *keys: str | bytes) -> List[Optional[bytes]]:
         if not keys:
             return []
         return await self.redis.mget(*keys)
 
-    async def exists(self, key: str) -> bool:
+    async def exists(self, key: str | bytes) -> bool:
         return bool(await self.redis.exists(key))
 
-    async def delete(self, key: str):
+    async def delete(self, key: str | bytes):
         await self.redis.delete(key)
 
     async def sadd(self, name: str, *values: str) -> int:
@@ -137,3 +467,6 @@ class RedisStateStoreProvider(StateStoreProvider):
 
     async def smembers(self, name: str) -> Set[bytes]:
         return await self.redis.smembers(name)
+
+    def pipeline(self) -> Any:
+        return self.redis.pipeline(transaction=False)
@@ -0,0 +1,58 @@
+"""
+Codec for queue payloads. JSON (via orjson when available) is the default;
+msgpack is opt-in per writer. Readers detect the format from the first byte,
+so either side can switch codecs while the other still drains old payloads.
+"""
+
+import json
+import logging
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+_msgpack_missing_logged = False
+
+JSON = "json"
+MSGPACK = "msgpack"
+
+
+def is_msgpack(data: bytes | str) -> bool:
+    # JSON documents start with an ASCII byte; msgpack maps/arrays never do
+    return not isinstance(data, str) and len(data) > 0 and data[0] >= 0x80
+
+
+def loads(data: bytes | str) -> Any:
+    """Parses a JSON or msgpack payload straight from bytes."""
+    if is_msgpack(data):
+        if msgpack is None:
+            raise ValueError("msgpack payload received but msgpack is not installed")
+        return msgpack.unpackb(data, raw=False)
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, codec: str = JSON) -> bytes:
+    """
+    Serializes to bytes ready to push as-is: compact UTF-8 JSON, or msgpack
+    when requested and installed (JSON otherwise, which readers accept too).
+    """
+    global _msgpack_missing_logged
+    if codec == MSGPACK:
+        if msgpack is not None:
+            return msgpack.packb(obj, use_bin_type=True)
+        if not _msgpack_missing_logged:
+            logger.warning("msgpack codec requested but not installed; using JSON")
+            _msgpack_missing_logged = True
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
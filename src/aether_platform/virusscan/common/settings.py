@@ -1,4 +1,20 @@
 import os
+from typing import Any, Callable
+
+
+def env_number(
+    value: Any, env_name: str, default: int | float, cast: Callable = int
+) -> int | float:
+    """
+    Resolves a numeric setting: an explicit argument wins, then the
+    environment variable, then ``default`` (also used when parsing fails).
+    """
+    if value is None or value == "":
+        value = os.getenv(env_name, default)
+    try:
+        return cast(value)
+    except (ValueError, TypeError):
+        return default
 
 
 class BaseSettings:
@@ -11,8 +27,13 @@ class BaseSettings:
         scan_tmp_dir: str = None,
     ):
         self.redis_host = redis_host or os.getenv("REDIS_HOST", "localhost")
-        try:
-            self.redis_port = int(redis_port or os.getenv("REDIS_PORT", 6379))
-        except (ValueError, TypeError):
-            self.redis_port = 6379
+        self.redis_port = env_number(redis_port, "REDIS_PORT", 6379)
+        # Upper bound for each process's Redis connection pool; see the
+        # containers for how each side sizes it against its concurrency
+        self.redis_max_connections = env_number(None, "REDIS_MAX_CONNECTIONS", 128)
         self.scan_tmp_dir = scan_tmp_dir or os.getenv("SCAN_TMP_DIR", "/tmp/virusscan")
+        # Redis Stream on which consumers announce finished scan results
+        self.result_channel = os.getenv("RESULT_CHANNEL", "scan_results")
+        # Encoding for payloads this process writes (json|msgpack); readers
+        # accept both, so flip it only once every reader runs this version
+        self.task_codec = os.getenv("TASK_CODEC", "json").lower()
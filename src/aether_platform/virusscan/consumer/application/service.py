@@ -1,12 +1,14 @@
 import asyncio
-import json
 import logging
 import time
-from typing import Any, Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Any, Callable, Optional
 
 from dependency_injector.wiring import Provide, inject
 from prometheus_client import Counter, Histogram
 
+from aether_platform.virusscan.common import serialization
 from aether_platform.virusscan.common.queue.provider import (
     QueueProvider,
     StateStoreProvider,
@@ -14,7 +16,11 @@ from aether_platform.virusscan.common.queue.provider import (
 from aether_platform.virusscan.consumer.infrastructure.engine_client import (
     ScannerEngineClient,
 )
+from aether_platform.virusscan.consumer.infrastructure.result_publisher import (
+    RedisResultPublisher,
+)
 from aether_platform.virusscan.consumer.settings import Settings
+from aether_platform.virusscan.domain.models import TaskHeader
 
 # TAT計測用メトリクス
 # stage: "wait" (キュー投入〜処理開始), "process" (処理時間), "total" (キュー投入〜完了)
@@ -64,6 +70,16 @@ SCAN_RESULTS_TOTAL = Counter(
 )
 
 
+@lru_cache(maxsize=None)
+def _child(metric, *label_values: str):
+    """
+    Labelled metric child, resolved once per label combination. Label values
+    come from small fixed sets, so the cache stays tiny while every task skips
+    the validation and locking of ``labels()``.
+    """
+    return metric.labels(*label_values)
+
+
 def _size_class(nbytes: int) -> str:
     """Classify byte count into a human-readable size bucket label."""
     if nbytes < 1024:
@@ -87,8 +103,15 @@ class ScannerTaskService:
     Coordinates downloading the file, executing the scan, and reporting results.
     """
 
-    def _get_free_memory_mb(self) -> float:
-        """Internal helper to calculate available system memory in MB."""
+    # Seconds a last-TAT sample stays visible to the producer's congestion check
+    _LAST_TAT_TTL = 120
+    # Payloads above this are decoded off the event loop. Decoding already
+    # goes through serialization.loads (orjson / msgpack); the pool only
+    # moves the remaining parse cost of large jobs off the loop thread.
+    _DECODE_OFFLOAD_BYTES = 4096
+
+    def get_free_memory_mb(self) -> float:
+        """Calculates available system memory in MB (inf when checks are disabled)."""
         if not self.settings.enable_memory_check:
             return float("inf")
         try:
@@ -101,15 +124,25 @@ class ScannerTaskService:
 
     async def _send_ack(self, stream_id: str):
         """Signals to the producer that the task has been accepted by a worker."""
-        ack_key = f"ack:{stream_id}"
-        await self.provider.push(ack_key, b"1")
-        await self.provider.expire(ack_key, 300)
+        await self.provider.push_with_ttl(f"ack:{stream_id}", b"1", 300)
 
     async def _report_result(self, stream_id: str, result_payload: dict):
-        """Internal helper to persist scan results to the queue provider."""
-        result_json = json.dumps(result_payload).encode("utf-8")
+        """
+        Internal helper to persist scan results to the queue provider.
+        The result list stays the source of truth (with a TTL, since producers
+        reading the result stream never pop it); the stream entry wakes the
+        waiting producer without it holding a blocking BRPOP connection.
+        """
+        result_json = serialization.dumps(result_payload, self.settings.task_codec)
+        if self.result_publisher is not None:
+            # Batched in the background; the worker moves on immediately
+            self.result_publisher.publish(stream_id, result_json)
+            return
         result_key = f"result:{stream_id}"
-        await self.provider.push(result_key, result_json)
+        await self.provider.push_with_ttl(result_key, result_json, 300)
+        await self.provider.publish(
+            self.settings.result_channel, stream_id.encode("utf-8") + b"|" + result_json
+        )
 
     async def _notify_console(
         self, tenant_id: str, virus_name: str, task_id: str, client_ip: str = "unknown"
@@ -140,13 +173,9 @@ class ScannerTaskService:
 
     async def _process_stream_task(
         self,
-        stream_id: str,
-        enqueued_at: float,
+        header: TaskHeader,
         queue_name: str,
         start_process_time: float,
-        tenant_id: str = "unknown",
-        client_ip: str = "unknown",
-        user_id: str = "unknown",
     ):
         """
         [Stage 2: Scanning Workflow]
@@ -157,19 +186,23 @@ class ScannerTaskService:
             2. Stream Monitor: Redis Streamからチャンクを順次拾い、ClamAVへ転送します（追いかけスキャン）。
             3. Finalize: 全チャンク走査後、結果を報告します。
         """
+        stream_id = header.stream_id
+        enqueued_at = header.enqueued_at
+
         # 1. ACK Handshake (Stage 1 の完了通知)
         await self._send_ack(stream_id)
 
         # 2. Data Monitoring & Scan Execution (Stage 2 ストリームスキャン)
         try:
             # We use RedisStreamProvider which is async
-            provider = self.provider_factory("STREAM", chunks_key=stream_id)
+            provider = self.provider_factory("STREAM", chunks_key=header.chunks_key)
         except Exception as e:
             self.logger.error(f"Failed to create STREAM provider for {stream_id}: {e}")
             return
 
         # 3. Execute Scan
-        mem_before = self._get_free_memory_mb()
+        priority = "high" if "priority" in queue_name else "normal"
+        mem_before = self.get_free_memory_mb()
         start_scan_time = time.time()
 
         try:
@@ -177,15 +210,12 @@ class ScannerTaskService:
         except Exception as e:
             error_payload = {"status": "ERROR", "message": str(e)}
             await self._report_result(stream_id, error_payload)
-            SCAN_RESULTS_TOTAL.labels(
-                priority="high" if "priority" in queue_name else "normal",
-                result="error",
-            ).inc()
+            _child(SCAN_RESULTS_TOTAL, priority, "error").inc()
             return
 
         end_time = time.time()
         duration = end_time - start_scan_time
-        mem_after = self._get_free_memory_mb()
+        mem_after = self.get_free_memory_mb()
         mem_delta = mem_before - mem_after if mem_before != float("inf") else 0
 
         # TAT Calculations (seconds)
@@ -193,20 +223,19 @@ class ScannerTaskService:
         process_tat = end_time - start_process_time
         total_tat = end_time - enqueued_at
 
-        priority = "high" if "priority" in queue_name else "normal"
         result_label = "infected" if is_virus else "clean"
         sc = _size_class(bytes_scanned)
 
         # Record metrics to Prometheus
-        TAT_HISTOGRAM.labels(priority=priority, stage="wait").observe(wait_tat)
-        TAT_HISTOGRAM.labels(priority=priority, stage="process").observe(process_tat)
-        TAT_HISTOGRAM.labels(priority=priority, stage="total").observe(total_tat)
+        _child(TAT_HISTOGRAM, priority, "wait").observe(wait_tat)
+        _child(TAT_HISTOGRAM, priority, "process").observe(process_tat)
+        _child(TAT_HISTOGRAM, priority, "total").observe(total_tat)
 
         # Size & size-based duration metrics
-        SCAN_SIZE_BYTES.labels(priority=priority, result=result_label).observe(bytes_scanned)
-        SCAN_BYTES_TOTAL.labels(priority=priority).inc(bytes_scanned)
-        SCAN_DURATION_BY_SIZE.labels(priority=priority, size_class=sc).observe(process_tat)
-        SCAN_RESULTS_TOTAL.labels(priority=priority, result=result_label).inc()
+        _child(SCAN_SIZE_BYTES, priority, result_label).observe(bytes_scanned)
+        _child(SCAN_BYTES_TOTAL, priority).inc(bytes_scanned)
+        _child(SCAN_DURATION_BY_SIZE, priority, sc).observe(process_tat)
+        _child(SCAN_RESULTS_TOTAL, priority, result_label).inc()
 
         self.logger.info(
             f"Scan Done {stream_id} [{priority}]: {duration * 1000:.1f}ms, "
@@ -237,10 +266,10 @@ class ScannerTaskService:
             # Using create_task to fire and forget if we don't want to wait.
             asyncio.create_task(
                 self._notify_console(
-                    tenant_id=tenant_id,
+                    tenant_id=header.tenant_id,
                     virus_name=virus_name,
                     task_id=stream_id,
-                    client_ip=client_ip,
+                    client_ip=header.client_ip,
                 )
             )
 
@@ -248,8 +277,8 @@ class ScannerTaskService:
         if self.nats_publisher:
             asyncio.create_task(
                 self.nats_publisher.publish_scan_result(
-                    tenant_id=tenant_id,
-                    user_id=user_id,
+                    tenant_id=header.tenant_id,
+                    user_id=header.user_id,
                     is_infected=is_virus,
                     virus_name=virus_name,
                     stream_id=stream_id,
@@ -260,10 +289,15 @@ class ScannerTaskService:
 
         # 5. Record Metrics (Legacy StateStore for backward compatibility if needed)
         try:
+            # The producer bypasses new scans while this is high, which also
+            # stops it being refreshed; the TTL lets a stale sample decay
             tat_key = f"tat_{priority}_last"
-            await self.store.set(
-                tat_key, str(total_tat * 1000)
-            )  # Store in ms for compatibility
+            tat_ms = str(total_tat * 1000)  # Stored in ms for compatibility
+            if self.result_publisher is not None:
+                # Written with the result in one pipeline, newest sample wins
+                self.result_publisher.record(tat_key, tat_ms, self._LAST_TAT_TTL)
+            else:
+                await self.store.set(tat_key, tat_ms, ex=self._LAST_TAT_TTL)
         except Exception as e:
             self.logger.warning(f"Failed to record metrics in StateStore: {e}")
 
@@ -276,6 +310,7 @@ class ScannerTaskService:
         engine: ScannerEngineClient = Provide["engine"],
         provider_factory: Callable[..., Any] = Provide["data_provider"],
         nats_publisher=None,
+        result_publisher: Optional[RedisResultPublisher] = None,
     ):
         """
         Initializes the task service.
@@ -286,40 +321,37 @@ class ScannerTaskService:
         self.engine = engine
         self.provider_factory = provider_factory
         self.nats_publisher = nats_publisher
+        self.result_publisher = result_publisher
         self.logger = logging.getLogger(__name__)
+        self._decode_pool = ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="task-decode"
+        )
 
     async def process_task(
-        self, task_data: str, queue_name: str, start_process_time: float
+        self, task_data: bytes, queue_name: str, start_process_time: float
     ):
         """
         Orchestrates the lifecycle of a single scan task.
-        Handles JSON job format: { "stream_id": "...", "enqueued_at": ..., ... }
+        Handles the job format { "stream_id": "...", "enqueued_at": ..., ... }
+        encoded as JSON or msgpack, and the legacy pipe-delimited task line.
+        ``task_data`` is the raw payload as popped from the queue.
         """
+        parse = partial(
+            TaskHeader.parse, task_data, default_enqueued_at=start_process_time
+        )
         try:
-            job = json.loads(task_data)
-            stream_id = job.get("stream_id")
-            enqueued_at = job.get("enqueued_at", start_process_time)
-
-            if not stream_id:
-                self.logger.error(f"Job missing stream_id: {task_data}")
-                return
-
-            tenant_id = job.get("tenant_id", "unknown")
-            client_ip = job.get("client_ip", "unknown")
-            user_id = job.get("user_id", "unknown")
-
-            await self._process_stream_task(
-                stream_id,
-                enqueued_at,
-                queue_name,
-                start_process_time,
-                tenant_id=tenant_id,
-                client_ip=client_ip,
-                user_id=user_id,
-            )
-        except json.JSONDecodeError:
-            self.logger.error(
-                f"Failed to decode task JSON (might be old format): {task_data}"
-            )
+            if len(task_data) > self._DECODE_OFFLOAD_BYTES:
+                # Keeps the loop popping and scanning while a large job decodes
+                loop = asyncio.get_running_loop()
+                header = await loop.run_in_executor(self._decode_pool, parse)
+            else:
+                header = parse()
+        except ValueError as e:
+            # JSONDecodeError and msgpack's unpack errors are ValueErrors
+            self.logger.error(f"Failed to decode task ({e}): {task_data!r}")
+            return
+
+        try:
+            await self._process_stream_task(header, queue_name, start_process_time)
         except Exception as e:
             self.logger.error(f"Failed to process task: {e}")
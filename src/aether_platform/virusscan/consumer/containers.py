@@ -4,7 +4,8 @@ from dependency_injector import containers, providers
 from aether_platform.virusscan.common.providers import (
     InlineStreamProvider, RedisStreamProvider, SharedDiskStreamProvider)
 from aether_platform.virusscan.common.queue.provider import (
-    RedisQueueProvider, RedisStateStoreProvider)
+    RedisQueueProvider, RedisSortedSetQueueProvider, RedisStateStoreProvider,
+    RedisStreamQueueProvider)
 from aether_platform.virusscan.consumer.application.service import \
     ScannerTaskService
 from aether_platform.virusscan.consumer.infrastructure.coordinator import \
@@ -13,6 +14,8 @@ from aether_platform.virusscan.consumer.infrastructure.engine_client import \
     ScannerEngineClient
 from aether_platform.virusscan.consumer.infrastructure.nats_publisher import \
     NatsNotificationPublisher
+from aether_platform.virusscan.consumer.infrastructure.result_publisher import \
+    RedisResultPublisher
 from aether_platform.virusscan.consumer.interfaces.worker.handler import \
     VirusScanHandler
 from aether_platform.virusscan.consumer.settings import Settings
@@ -33,18 +36,49 @@ class Container(containers.DeclarativeContainer):
         scan_mount=config.scan_mount,
         enable_memory_check=config.enable_memory_check,
         min_free_memory_mb=config.min_free_memory_mb,
+        pop_batch_size=config.pop_batch_size,
+        clamd_session_idle_timeout=config.clamd_session_idle_timeout,
+        max_in_flight_scans=config.max_in_flight_scans,
     )
 
-    redis_client = providers.Singleton(
-        redis.Redis,
+    # One bounded pool per process shared by every worker loop. Each of the
+    # five worker loops holds a connection while blocked in its pop, each of
+    # up to WORKER_CONCURRENCY dispatched tasks holds one for its chunk reads
+    # (then briefly for its ACK), and the result publisher and coordinator
+    # take one per flush/heartbeat, so REDIS_MAX_CONNECTIONS should stay
+    # above WORKER_CONCURRENCY + 5 + 2
+    redis_pool = providers.Singleton(
+        redis.BlockingConnectionPool,
         host=settings.provided.redis_host,
         port=settings.provided.redis_port,
+        max_connections=settings.provided.redis_max_connections,
+        timeout=5,
+        socket_keepalive=True,
+        health_check_interval=30,
         decode_responses=False,
     )
 
-    queue_provider = providers.Singleton(
-        RedisQueueProvider,
-        redis_client=redis_client,
+    redis_client = providers.Singleton(
+        redis.Redis,
+        connection_pool=redis_pool,
+    )
+
+    # Task queue layout (list: one list per queue, zset: one shared sorted set,
+    # stream: one stream per queue read through a consumer group)
+    queue_provider = providers.Selector(
+        providers.Callable(os.getenv, "QUEUE_BACKEND", "list"),
+        list=providers.Singleton(
+            RedisQueueProvider,
+            redis_client=redis_client,
+        ),
+        zset=providers.Singleton(
+            RedisSortedSetQueueProvider,
+            redis_client=redis_client,
+        ),
+        stream=providers.Singleton(
+            RedisStreamQueueProvider,
+            redis_client=redis_client,
+        ),
     )
 
     state_store_provider = providers.Singleton(
@@ -60,7 +94,10 @@ class Container(containers.DeclarativeContainer):
 
     # Infrastructure
     engine = providers.Singleton(
-        ScannerEngineClient, clamd_url=settings.provided.clamd_url
+        ScannerEngineClient,
+        clamd_url=settings.provided.clamd_url,
+        session_idle_timeout=settings.provided.clamd_session_idle_timeout,
+        max_in_flight_scans=settings.provided.max_in_flight_scans,
     )
 
     coordinator = providers.Singleton(
@@ -68,6 +105,13 @@ class Container(containers.DeclarativeContainer):
         queue_provider=queue_provider,
         state_store=state_store_provider,
         clamd_url=settings.provided.clamd_url,
+        heartbeat_interval=settings.provided.heartbeat_interval,
+    )
+
+    result_publisher = providers.Singleton(
+        RedisResultPublisher,
+        redis_client=redis_client,
+        channel=settings.provided.result_channel,
     )
 
     nats_publisher = providers.Singleton(
@@ -84,6 +128,7 @@ class Container(containers.DeclarativeContainer):
         engine=engine,
         provider_factory=data_provider,
         nats_publisher=nats_publisher,
+        result_publisher=result_publisher,
     )
 
     # Interface
@@ -24,6 +24,7 @@ class ClusterCoordinator:
         queue_provider: QueueProvider = Provide["queue_provider"],
         state_store: StateStoreProvider = Provide["state_store_provider"],
         clamd_url: str = Provide["settings.clamd_url"],
+        heartbeat_interval: float = 30.0,
     ):
         """
         Initializes the cluster coordinator.
@@ -32,32 +33,37 @@ class ClusterCoordinator:
             queue_provider: Distributed queue provider for messaging.
             state_store: Distributed state store provider for cluster state.
             clamd_url: URL for the local clamd instance.
+            heartbeat_interval: Minimum seconds between heartbeat writes.
         """
         self.queue_provider = queue_provider
         self.state_store = state_store
         self.clamd_url = clamd_url
+        self.heartbeat_interval = heartbeat_interval
         self.logger = logging.getLogger(__name__)
         self.pod_name = os.getenv("HOSTNAME", "unknown-pod")
         self.current_epoch = 0
         self.last_heartbeat = 0
 
+    async def _get_node_heartbeats(self) -> list:
+        """Internal helper returning (node, raw heartbeat) for every registered node."""
+        nodes = [
+            node_bin.decode("utf-8") if isinstance(node_bin, bytes) else str(node_bin)
+            for node_bin in await self.state_store.smembers("clamav:active_nodes")
+        ]
+        # One MGET instead of a GET round-trip per node
+        heartbeats = await self.state_store.mget(
+            *(f"clamav:heartbeat:{node}" for node in nodes)
+        )
+        return list(zip(nodes, heartbeats))
+
     async def _get_active_node_count(self) -> int:
         """Internal helper to count the number of live nodes in the cluster."""
         try:
-            nodes = await self.state_store.smembers("clamav:active_nodes")
-            active_count = 0
-            for node_bin in nodes:
-                node = (
-                    node_bin.decode("utf-8")
-                    if isinstance(node_bin, bytes)
-                    else str(node_bin)
-                )
-                heartbeat = await self.state_store.get(f"clamav:heartbeat:{node}")
-                if heartbeat:
-                    active_count += 1
-                else:
-                    await self.state_store.srem("clamav:active_nodes", node)
-            return active_count
+            node_heartbeats = await self._get_node_heartbeats()
+            stale = [node for node, heartbeat in node_heartbeats if not heartbeat]
+            if stale:
+                await self.state_store.srem("clamav:active_nodes", *stale)
+            return len(node_heartbeats) - len(stale)
         except Exception as e:
             self.logger.warning(f"Failed to count active nodes: {e}")
             return 1
@@ -89,15 +95,8 @@ class ClusterCoordinator:
 
     async def _handle_scale_down(self, target_epoch: int):
         """Internal helper to clear surge requests once all nodes have synchronized."""
-        nodes = await self.state_store.smembers("clamav:active_nodes")
         all_updated = True
-        for node_bin in nodes:
-            node = (
-                node_bin.decode("utf-8")
-                if isinstance(node_bin, bytes)
-                else str(node_bin)
-            )
-            hb_raw = await self.state_store.get(f"clamav:heartbeat:{node}")
+        for _, hb_raw in await self._get_node_heartbeats():
             if hb_raw:
                 hb = (
                     hb_raw.decode("utf-8") if isinstance(hb_raw, bytes) else str(hb_raw)
@@ -114,37 +113,80 @@ class ClusterCoordinator:
             self.logger.info("All nodes updated. Terminating surge request.")
             await self.state_store.delete("clamav:scaling_request")
 
+    def heartbeat_pipeline(self, pipe) -> float | None:
+        """
+        Queues the heartbeat SET/SADD onto ``pipe`` if the heartbeat interval has elapsed.
+
+        Returns:
+            The heartbeat timestamp if commands were queued, otherwise None.
+        """
+        now = time.time()
+        if now - self.last_heartbeat < self.heartbeat_interval:
+            return None
+
+        heartbeat_key = f"clamav:heartbeat:{self.pod_name}"
+        # Heartbeat value includes pod name and current epoch for monitoring;
+        # the key survives one missed beat
+        pipe.set(
+            heartbeat_key,
+            f"{now}|{self.current_epoch}",
+            ex=max(1, int(self.heartbeat_interval * 2)),
+        )
+        pipe.sadd("clamav:active_nodes", self.pod_name)
+        return now
+
+    def check_reload_pipeline(self, pipe):
+        """Queues the target epoch lookup used by handle_sequential_update onto ``pipe``."""
+        pipe.mget("clamav:target_epoch", "clamav:target_epoch_updated_at")
+
+    def _mark_heartbeat_sent(self, sent_at: float):
+        self.logger.debug(
+            f"Heartbeat sent for {self.pod_name} (Epoch: {self.current_epoch})"
+        )
+        self.last_heartbeat = sent_at
+
     async def heartbeat(self):
         """
         Publishes a heartbeat to the cluster registry.
         Should be called periodically in the main loop.
         """
-        now = time.time()
-        if now - self.last_heartbeat < 30:
-            return
-
         try:
-            heartbeat_key = f"clamav:heartbeat:{self.pod_name}"
-            # Heartbeat value includes pod name and current epoch for monitoring
-            await self.state_store.set(
-                heartbeat_key, f"{now}|{self.current_epoch}", ex=60
-            )
-            await self.state_store.sadd("clamav:active_nodes", self.pod_name)
-            self.logger.debug(
-                f"Heartbeat sent for {self.pod_name} (Epoch: {self.current_epoch})"
-            )
-            self.last_heartbeat = now
+            pipe = self.state_store.pipeline()
+            sent_at = self.heartbeat_pipeline(pipe)
+            if sent_at is None:
+                return
+            await pipe.execute()
+            self._mark_heartbeat_sent(sent_at)
         except Exception as e:
             self.logger.warning(f"Failed to send heartbeat: {e}")
 
-    async def handle_sequential_update(self):
+    async def sync_cluster_state(self):
+        """
+        Sends the heartbeat and fetches the reload target in a single round-trip,
+        then runs the sequential update logic against the fetched target.
+        """
+        pipe = self.state_store.pipeline()
+        sent_at = self.heartbeat_pipeline(pipe)
+        self.check_reload_pipeline(pipe)
+        results = await pipe.execute()
+        if sent_at is not None:
+            self._mark_heartbeat_sent(sent_at)
+
+        await self.handle_sequential_update(target_info=results[-1])
+
+    async def handle_sequential_update(self, target_info: list | None = None):
         """
         Main coordination logic for performing zero-downtime reloads.
         Uses surge scaling to maintain capacity while nodes reload sequentially.
+
+        Args:
+            target_info: Pre-fetched [target_epoch, updated_at] values. Fetched from
+                the state store when omitted.
         """
-        target_info = await self.state_store.mget(
-            "clamav:target_epoch", "clamav:target_epoch_updated_at"
-        )
+        if target_info is None:
+            target_info = await self.state_store.mget(
+                "clamav:target_epoch", "clamav:target_epoch_updated_at"
+            )
         if not target_info or not target_info[0]:
             return
 
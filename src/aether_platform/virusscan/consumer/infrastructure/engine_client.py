@@ -1,30 +1,94 @@
 import asyncio
 import logging
 import struct
-from typing import Tuple
+import time
+from typing import List, Tuple
 
 from ...common.providers import DataProvider
 
+# INSTREAM frames each chunk with a 4-byte big-endian length
+_PACK_U32_BE = struct.Struct("!I").pack
+_END_OF_STREAM = _PACK_U32_BE(0)
+
+
+class _ClamdSession:
+    """An open clamd connection in IDSESSION mode."""
+
+    __slots__ = ("reader", "writer", "last_used")
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.last_used = time.monotonic()
+
 
 class ScannerEngineClient:
     """
     Infrastructure client for interacting with the ClamAV (clamd) scanning engine.
     Handles the low-level INSTREAM protocol asynchronously.
+    Connections are kept open as clamd IDSESSIONs and reused across scans.
     """
 
-    def __init__(self, clamd_url: str):
+    def __init__(
+        self,
+        clamd_url: str,
+        session_idle_timeout: float = 20.0,
+        max_in_flight_scans: int = 10,
+    ):
         """
         Initializes the ClamAV client.
 
         Args:
             clamd_url: The URL for the clamd service (e.g., tcp://127.0.0.1:3310).
+            session_idle_timeout: Seconds an idle session may be reused. Must stay
+                below clamd's IdleTimeout (30s by default). 0 disables reuse.
+            max_in_flight_scans: Upper bound on concurrent INSTREAM sessions across
+                all workers; keep at or below clamd's MaxThreads.
         """
         from urllib.parse import urlparse
 
         url = urlparse(clamd_url)
         self.host = url.hostname or "localhost"
         self.port = url.port or 3310
+        self.session_idle_timeout = session_idle_timeout
+        self._in_flight = asyncio.Semaphore(max(1, max_in_flight_scans))
         self.logger = logging.getLogger(__name__)
+        # Ordered by last use, oldest first
+        self._idle_sessions: List[_ClamdSession] = []
+
+    async def _acquire_session(self) -> _ClamdSession:
+        """Returns a live idle session, or opens a new one."""
+        deadline = time.monotonic() - self.session_idle_timeout
+        while self._idle_sessions and self._idle_sessions[0].last_used < deadline:
+            self._close_session(self._idle_sessions.pop(0))
+
+        while self._idle_sessions:
+            session = self._idle_sessions.pop()
+            if not session.reader.at_eof() and not session.writer.is_closing():
+                return session
+            self._close_session(session)
+
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        writer.write(b"zIDSESSION\0")
+        return _ClamdSession(reader, writer)
+
+    def _release_session(self, session: _ClamdSession):
+        """Returns a healthy session to the idle pool."""
+        if self.session_idle_timeout <= 0:
+            self._close_session(session)
+            return
+        session.last_used = time.monotonic()
+        self._idle_sessions.append(session)
+
+    def _close_session(self, session: _ClamdSession):
+        session.writer.close()
+
+    async def close(self):
+        """Closes all idle sessions."""
+        sessions, self._idle_sessions = self._idle_sessions, []
+        for session in sessions:
+            session.writer.write(b"zEND\0")
+            self._close_session(session)
 
     async def scan(self, provider: DataProvider) -> Tuple[bool, str, int]:
         """
@@ -36,7 +100,15 @@ class ScannerEngineClient:
         Returns:
             A tuple of (is_infected, message, bytes_scanned).
         """
-        reader, writer = await asyncio.open_connection(self.host, self.port)
+        # Tasks beyond the cap wait here after their ACK, so the producer keeps
+        # buffering chunks instead of clamd queueing whole streams
+        async with self._in_flight:
+            return await self._scan(provider)
+
+    async def _scan(self, provider: DataProvider) -> Tuple[bool, str, int]:
+        session = await self._acquire_session()
+        reader, writer = session.reader, session.writer
+        healthy = False
         try:
             writer.write(b"zINSTREAM\0")
             await writer.drain()
@@ -46,18 +118,20 @@ class ScannerEngineClient:
             total_bytes = 0
             try:
                 async for chunk in provider.get_chunks():
-                    total_bytes += len(chunk)
-                    writer.write(struct.pack("!I", len(chunk)))
-                    writer.write(chunk)
+                    size = len(chunk)
+                    total_bytes += size
+                    writer.writelines((_PACK_U32_BE(size), chunk))
                     await writer.drain()
 
-                writer.write(struct.pack("!I", 0))
+                writer.write(_END_OF_STREAM)
                 await writer.drain()
 
-                # Read response
-                data = await reader.read(4096)
-                response = data.decode("utf-8").strip()
+                # Session replies are NUL-terminated and prefixed with the
+                # request id, e.g. "1: stream: OK"
+                data = await reader.readuntil(b"\0")
+                response = data[:-1].decode("utf-8").partition(": ")[2].strip()
                 scan_success = True
+                healthy = True
             finally:
                 # Let provider cleanup (now async)
                 await provider.finalize(
@@ -73,5 +147,8 @@ class ScannerEngineClient:
             self.logger.error(f"Engine scan error: {e}")
             raise
         finally:
-            writer.close()
-            await writer.wait_closed()
+            # A session interrupted mid-INSTREAM has unknown protocol state
+            if healthy:
+                self._release_session(session)
+            else:
+                self._close_session(session)
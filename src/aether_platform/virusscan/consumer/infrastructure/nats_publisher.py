@@ -2,8 +2,8 @@
 
 import json
 import logging
+import time
 import uuid
-from datetime import datetime, timezone
 
 import nats
 from nats.aio.client import Client as NatsClient
@@ -11,6 +11,12 @@ from nats.aio.client import Client as NatsClient
 logger = logging.getLogger(__name__)
 
 
+def _utc_timestamp() -> str:
+    """ISO-8601 UTC timestamp (datetime.isoformat() shape) without building a datetime."""
+    sec, micros = divmod(time.time_ns() // 1000, 1_000_000)
+    return f"{time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(sec))}.{micros:06d}+00:00"
+
+
 class NatsNotificationPublisher:
     """Publishes scan result notifications to NATS for real-time delivery to VS Code."""
 
@@ -84,7 +90,7 @@ class NatsNotificationPublisher:
         payload = {
             "version": "1.0",
             "id": str(uuid.uuid4()),
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": _utc_timestamp(),
             "source": "virusscanner-consumer",
             "tenant_id": tenant_id,
             "user_id": user_id,
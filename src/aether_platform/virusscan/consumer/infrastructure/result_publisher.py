@@ -0,0 +1,119 @@
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from ...common.queue.provider import RedisQueueProvider
+
+logger = logging.getLogger(__name__)
+
+
+class RedisResultPublisher:
+    """
+    Infrastructure component that writes scan results in the background.
+    Workers hand results over without waiting on Redis; everything queued
+    while a flush is in flight goes out together in the next pipeline.
+    Gauge-style keys recorded alongside (e.g. last TAT) ride the same
+    pipeline, coalesced so only the newest value per key is written.
+    """
+
+    # Results per pipeline; each costs LPUSH + EXPIRE + XADD
+    MAX_BATCH = 128
+    # Failed flushes retry with capped backoff until shutdown; once closing,
+    # a batch is given up after this many attempts so close() cannot hang
+    _RETRIES = 3
+    _MAX_BACKOFF = 5.0
+
+    def __init__(self, redis_client: Any, channel: str = "scan_results", ttl: int = 300):
+        """
+        Initializes the publisher.
+
+        Args:
+            redis_client: Async Redis client.
+            channel: Result stream the producers read.
+            ttl: Seconds a result list is kept for producers that poll it.
+        """
+        self.redis = redis_client
+        self.channel = channel
+        self.ttl = ttl
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._samples: Dict[str, Tuple[str, int]] = {}
+        self._closing = False
+
+    def _ensure_started(self):
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush_loop())
+
+    def publish(self, task_id: str, payload: bytes):
+        """Queues a result for the next flush and returns immediately."""
+        self._ensure_started()
+        self._queue.put_nowait((task_id, payload))
+
+    def record(self, key: str, value: str, ttl: int):
+        """
+        Sets ``key`` to ``value`` (expiring after ``ttl`` seconds) in the next
+        flush; a later record of the same key replaces the pending value.
+        """
+        self._ensure_started()
+        self._samples[key] = (value, ttl)
+        if self._queue.empty():
+            # Nothing else queued to carry the sample: wake the flush loop
+            self._queue.put_nowait(None)
+
+    async def _flush_loop(self):
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.MAX_BATCH and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                await self._flush(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _flush(self, batch: List[Optional[Tuple[str, bytes]]]):
+        samples, self._samples = self._samples, {}
+        results = [item for item in batch if item is not None]
+        attempt = 0
+        while True:
+            attempt += 1
+            pipe = self.redis.pipeline(transaction=False)
+            for task_id, payload in results:
+                result_key = f"result:{task_id}"
+                pipe.lpush(result_key, payload)
+                pipe.expire(result_key, self.ttl)
+                pipe.xadd(
+                    self.channel,
+                    {"m": task_id.encode("utf-8") + b"|" + payload},
+                    maxlen=RedisQueueProvider.BROADCAST_MAXLEN,
+                    approximate=True,
+                )
+            for key, (value, ttl) in samples.items():
+                pipe.set(key, value, ex=ttl)
+            try:
+                await pipe.execute()
+                return
+            except Exception as e:
+                if self._closing and attempt >= self._RETRIES:
+                    logger.error(
+                        f"Dropped {len(results)} scan results after {attempt} attempts: {e}"
+                    )
+                    return
+                logger.warning(f"Result flush failed (attempt {attempt}): {e}")
+                # Producers are still waiting on these results; keep trying
+                await asyncio.sleep(min(self._MAX_BACKOFF, 0.1 * 2 ** (attempt - 1)))
+
+    async def close(self):
+        """Flushes every queued result, then stops the background task."""
+        self._closing = True
+        if self._task is None:
+            return
+        if not self._task.done():
+            await self._queue.join()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
@@ -1,7 +1,7 @@
 import asyncio
 import logging
 import time
-from typing import Optional
+from typing import Optional, Set
 
 from dependency_injector.wiring import Provide, inject
 
@@ -45,6 +45,68 @@ class VirusScanHandler:
         self.coordinator = coordinator
         self.task_service = task_service
         self.logger = logging.getLogger(__name__)
+        # Bounds dispatched tasks across all worker loops of this handler
+        self._slots = asyncio.Semaphore(settings.worker_concurrency)
+        self._in_flight: Set[asyncio.Task] = set()
+
+    def _pop_count(self) -> int:
+        """Batch size wanted for the next poll; single pops while memory is constrained."""
+        if (
+            self.settings.enable_memory_check
+            and self.task_service.get_free_memory_mb()
+            < self.settings.min_free_memory_mb
+        ):
+            return 1
+        return max(1, self.settings.pop_batch_size)
+
+    async def _reserve_slots(self) -> int:
+        """
+        Waits for one dispatch slot, then takes as many more as are free right
+        now (up to the wanted batch size). Returns how many are held.
+        """
+        await self._slots.acquire()
+        reserved, wanted = 1, self._pop_count()
+        # Acquiring an unlocked semaphore completes without suspending
+        while reserved < wanted and not self._slots.locked():
+            await self._slots.acquire()
+            reserved += 1
+        return reserved
+
+    def _release_slots(self, count: int):
+        for _ in range(count):
+            self._slots.release()
+
+    def _dispatch(self, task_data_raw: bytes, queue_name: str, start_process_time: float):
+        """Runs a task in the background; its slot must already be held."""
+        task = asyncio.create_task(
+            self._process_and_ack(task_data_raw, queue_name, start_process_time)
+        )
+        self._in_flight.add(task)
+        task.add_done_callback(self._task_done)
+
+    def _task_done(self, task: asyncio.Task):
+        self._in_flight.discard(task)
+        self._slots.release()
+        if not task.cancelled() and task.exception() is not None:
+            self.logger.error(f"Task dispatch error: {task.exception()}")
+
+    async def drain(self):
+        """Waits for every dispatched task to finish."""
+        while self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+
+    async def _process_and_ack(
+        self, task_data_raw: bytes, queue_name: str, start_process_time: float
+    ):
+        """Processes one task, then confirms it to backends that track delivery."""
+        try:
+            await self.task_service.process_task(
+                task_data_raw,
+                queue_name,
+                start_process_time=start_process_time,
+            )
+        finally:
+            await self.provider.ack(queue_name, task_data_raw)
 
     async def _worker_loop(
         self,
@@ -72,19 +134,30 @@ class VirusScanHandler:
                 if secondary_q:
                     queues.append(secondary_q)
 
-                # Queue Polling (Async)
-                result = await self.provider.pop(queues, timeout=2)
-                if not result:
+                # Reserve slots before popping, so a saturated consumer leaves
+                # tasks queued for other pods instead of hoarding them, and a
+                # popped task is dispatched without waiting on anything
+                reserved = await self._reserve_slots()
+                try:
+                    # Queue Polling (Async): blocks for the first task, then
+                    # drains whatever is already queued in the same round-trip
+                    batch = await self.provider.pop_batch(
+                        queues, count=reserved, timeout=2
+                    )
+                except BaseException:
+                    self._release_slots(reserved)
+                    raise
+                self._release_slots(reserved - len(batch))
+                if not batch:
                     continue
 
-                queue_name, task_data_raw = result
-                task_data = task_data_raw.decode("utf-8")
                 start_process_time = time.time()
 
-                # Delegate to Application Service for Affinity processing
-                await self.task_service.process_task(
-                    task_data, queue_name, start_process_time=start_process_time
-                )
+                # Delegate to Application Service for Affinity processing.
+                # Tasks run in the background so the loop pops again right
+                # away instead of waiting for the slowest task of the batch.
+                for queue_name, task_data_raw in batch:
+                    self._dispatch(task_data_raw, queue_name, start_process_time)
 
             except (asyncio.CancelledError, KeyboardInterrupt):
                 raise
@@ -117,11 +190,19 @@ class VirusScanHandler:
                     self.logger.info("Coordination loop shutting down gracefully...")
                     break
                 try:
-                    await self.coordinator.heartbeat()
-                    await self.coordinator.handle_sequential_update()
+                    # Heartbeat + reload target check share one pipelined round-trip
+                    await self.coordinator.sync_cluster_state()
                 except Exception as e:
                     self.logger.error(f"Coordination loop error: {e}")
-                await asyncio.sleep(30)  # Heartbeat interval
+                interval = self.settings.heartbeat_interval
+                if shutdown_event is None:
+                    await asyncio.sleep(interval)
+                    continue
+                # Wake early on shutdown instead of sleeping out the interval
+                try:
+                    await asyncio.wait_for(shutdown_event.wait(), timeout=interval)
+                except asyncio.TimeoutError:
+                    pass
 
         tasks = [asyncio.create_task(coordination_loop())]
 
@@ -164,6 +245,9 @@ class VirusScanHandler:
         for task in pending:
             task.cancel()
 
+        # Tasks already popped still get their scan, result and ACK
+        await self.drain()
+
         # Re-raise any exceptions from the done tasks
         for task in done:
             if not task.cancelled() and task.exception():
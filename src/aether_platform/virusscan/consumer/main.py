@@ -1,6 +1,8 @@
 import asyncio
 import logging
+import logging.handlers
 import os
+import queue
 import signal
 import sys
 import time
@@ -17,17 +19,61 @@ except ImportError:
     PrometheusPlugin = None
 from prometheus_client import make_asgi_app
 
+from ..common import event_loop
 from .containers import Container
+from .infrastructure.engine_client import ScannerEngineClient
 from .infrastructure.nats_publisher import NatsNotificationPublisher
+from .infrastructure.result_publisher import RedisResultPublisher
 from .interfaces.worker.handler import VirusScanHandler
 from .settings import Settings
 
 
+@get("/health")
+async def health_check() -> dict:
+    """Health check endpoint for Kubernetes liveness/readiness probes."""
+    return {"status": "ok", "timestamp": time.time()}
+
+
+_HEALTH_CONTENT_TYPE = (b"content-type", b"application/json")
+
+
+def _with_health_fast_path(app):
+    """
+    Wraps an ASGI app so GET /health is answered before routing, middleware
+    and response serialization; probe storms then cost almost nothing.
+    """
+
+    async def asgi(scope, receive, send):
+        if (
+            scope["type"] == "http"
+            and scope["method"] == "GET"
+            and scope["path"] == "/health"
+        ):
+            body = b'{"status":"ok","timestamp":%f}' % time.time()
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 200,
+                    "headers": [
+                        _HEALTH_CONTENT_TYPE,
+                        (b"content-length", b"%d" % len(body)),
+                    ],
+                }
+            )
+            await send({"type": "http.response.body", "body": body})
+            return
+        await app(scope, receive, send)
+
+    return asgi
+
+
 @inject
 def serve(
     handler: VirusScanHandler = Provide["handler"],
     settings: Settings = Provide["settings"],
     nats_publisher: NatsNotificationPublisher = Provide["nats_publisher"],
+    engine: ScannerEngineClient = Provide["engine"],
+    result_publisher: RedisResultPublisher = Provide["result_publisher"],
 ):
     """Starts the VirusScanner Consumer (Worker) and a metrics server with Graceful Shutdown."""
 
@@ -37,11 +83,6 @@ def serve(
     # Create the metrics app using make_asgi_app to ensure custom metrics are included
     metrics_app = make_asgi_app()
 
-    @get("/health")
-    async def health_check() -> dict:
-        """Health check endpoint for Kubernetes liveness/readiness probes."""
-        return {"status": "ok", "timestamp": time.time()}
-
     plugins = []
     if PrometheusPlugin:
         plugins.append(PrometheusPlugin(config=prometheus_config))
@@ -58,7 +99,9 @@ def serve(
     shutdown_event = asyncio.Event()
 
     async def run_server():
-        config = uvicorn.Config(app, host="0.0.0.0", port=9090, log_level="error")
+        config = uvicorn.Config(
+            _with_health_fast_path(app), host="0.0.0.0", port=9090, log_level="error"
+        )
         server = uvicorn.Server(config)
         await server.serve()
 
@@ -79,12 +122,15 @@ def serve(
         try:
             await asyncio.gather(handler.run(shutdown_event), run_server())
         finally:
+            # Results of scans that finished during shutdown still go out
+            await result_publisher.close()
+            await engine.close()
             if settings.nats_enabled:
                 await nats_publisher.disconnect()
 
     logging.info("Starting VirusScanner Consumer with Metrics/Health on port 9090")
     try:
-        asyncio.run(run_all())
+        event_loop.run(run_all())
     except KeyboardInterrupt:
         logging.info("Shutting down...")
 
@@ -105,20 +151,44 @@ async def set_target_epoch(redis_client=Provide["redis_client"]):
     logging.info(f"Target epoch set to {new_epoch}. Nodes will reload sequentially.")
 
 
+def _start_log_listener() -> logging.handlers.QueueListener:
+    """
+    Moves the root handlers behind a QueueHandler so per-scan log records are
+    written and flushed by a dedicated thread instead of the event loop.
+    """
+    root = logging.getLogger()
+    handlers = list(root.handlers)
+    log_queue = queue.SimpleQueue()
+    for h in handlers:
+        root.removeHandler(h)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    listener.start()
+    return listener
+
+
 def main():
     logging.basicConfig(
         level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
     )
+    listener = _start_log_listener()
 
     container = Container()
     container.wire(modules=[__name__])
 
     command = sys.argv[1] if len(sys.argv) > 1 else "serve"
 
-    if command == "set_epoch":
-        asyncio.run(set_target_epoch())
-    else:
-        serve()
+    try:
+        if command == "set_epoch":
+            event_loop.run(set_target_epoch())
+        else:
+            serve()
+    finally:
+        # Drain queued records before the process exits
+        listener.stop()
 
 
 if __name__ == "__main__":
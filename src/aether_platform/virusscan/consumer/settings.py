@@ -1,7 +1,7 @@
 import os
 from typing import List, Union
 
-from ..common.settings import BaseSettings
+from ..common.settings import BaseSettings, env_number
 
 
 class Settings(BaseSettings):
@@ -16,12 +16,32 @@ class Settings(BaseSettings):
         scan_mount: str = None,
         enable_memory_check: bool = None,
         min_free_memory_mb: int = None,
+        pop_batch_size: int = None,
+        worker_concurrency: int = None,
+        clamd_session_idle_timeout: float = None,
+        max_in_flight_scans: int = None,
+        heartbeat_interval: float = None,
     ):
         super().__init__(
             redis_host=redis_host, redis_port=redis_port, scan_tmp_dir=scan_mount
         )
         self.clamd_url = clamd_url or os.getenv("CLAMD_URL", "tcp://127.0.0.1:3310")
 
+        # Reuse clamd IDSESSION connections idle for less than this (0 disables)
+        self.clamd_session_idle_timeout = env_number(
+            clamd_session_idle_timeout, "CLAMD_SESSION_IDLE_TIMEOUT", 20.0, cast=float
+        )
+
+        # Concurrent scans across all workers (bounded by clamd MaxThreads)
+        self.max_in_flight_scans = env_number(
+            max_in_flight_scans, "MAX_IN_FLIGHT_SCANS", 10
+        )
+
+        # Seconds between cluster heartbeats (the key lives for two intervals)
+        self.heartbeat_interval = env_number(
+            heartbeat_interval, "HEARTBEAT_INTERVAL", 30.0, cast=float
+        )
+
         # Handle queues from env or list
         if isinstance(queues, str):
             self.queues = [q.strip() for q in queues.split(",")]
@@ -49,9 +69,17 @@ class Settings(BaseSettings):
             if enable_memory_check is not None
             else (os.getenv("ENABLE_MEMORY_CHECK", "false").lower() == "true")
         )
-        try:
-            self.min_free_memory_mb = int(
-                min_free_memory_mb or os.getenv("MIN_FREE_MEMORY_MB", 500)
-            )
-        except (ValueError, TypeError):
-            self.min_free_memory_mb = 500
+        self.min_free_memory_mb = env_number(
+            min_free_memory_mb, "MIN_FREE_MEMORY_MB", 500
+        )
+
+        # Max tasks a worker takes per queue poll (drained without extra RTTs)
+        self.pop_batch_size = max(
+            1, env_number(pop_batch_size, "POP_BATCH_SIZE", 4)
+        )
+
+        # Tasks in flight across all worker loops; loops keep popping while
+        # earlier tasks still wait on chunks or clamd
+        self.worker_concurrency = max(
+            1, env_number(worker_concurrency, "WORKER_CONCURRENCY", 20)
+        )
@@ -2,6 +2,8 @@ from dataclasses import dataclass
 from enum import Enum
 from typing import Optional
 
+from aether_platform.virusscan.common import serialization
+
 
 class ScanStatus(Enum):
     PENDING = "PENDING"
@@ -19,3 +21,51 @@ class ScanResult:
 
     def is_infected(self) -> bool:
         return self.status == ScanStatus.INFECTED
+
+
+@dataclass(slots=True)
+class TaskHeader:
+    """
+    Routing fields of a queued scan task, parsed once straight from the raw
+    queue payload. Accepts the job metadata format (JSON or msgpack) and the
+    legacy ``task_id|MODE|enqueued_ns|chunks_key`` line.
+    """
+
+    stream_id: str
+    enqueued_at: float
+    chunks_key: str
+    tenant_id: str = "unknown"
+    client_ip: str = "unknown"
+    user_id: str = "unknown"
+
+    @classmethod
+    def parse(cls, buf: bytes, default_enqueued_at: float) -> "TaskHeader":
+        """Raises ValueError for payloads that are not a usable task."""
+        if buf[:1] != b"{" and not serialization.is_msgpack(buf):
+            return cls._parse_legacy(buf)
+
+        job = serialization.loads(buf)
+        if not isinstance(job, dict):
+            raise ValueError("job metadata is not a mapping")
+        stream_id = job.get("stream_id")
+        if not stream_id:
+            raise ValueError("job missing stream_id")
+        return cls(
+            stream_id=stream_id,
+            enqueued_at=job.get("enqueued_at", default_enqueued_at),
+            chunks_key=stream_id,
+            tenant_id=job.get("tenant_id", "unknown"),
+            client_ip=job.get("client_ip", "unknown"),
+            user_id=job.get("user_id", "unknown"),
+        )
+
+    @classmethod
+    def _parse_legacy(cls, buf: bytes) -> "TaskHeader":
+        parts = buf.split(b"|", 3)
+        if len(parts) != 4 or parts[1] != b"STREAM" or not parts[0]:
+            raise ValueError("not a STREAM task line")
+        return cls(
+            stream_id=parts[0].decode("utf-8"),
+            enqueued_at=int(parts[2]) / 1e9,
+            chunks_key=parts[3].decode("utf-8"),
+        )
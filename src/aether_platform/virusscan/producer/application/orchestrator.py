@@ -1,12 +1,12 @@
-import json
 import logging
+import os
 import time
-import uuid
 from typing import Any, Dict
 
 from dependency_injector import providers
 from dependency_injector.wiring import Provide, inject
 
+from aether_platform.virusscan.common import serialization
 from aether_platform.virusscan.domain.models import ScanResult, ScanStatus
 from aether_platform.virusscan.producer.infrastructure.redis_adapter import \
     RedisScanAdapter
@@ -20,6 +20,10 @@ class ScanOrchestrator:
     Now fully asynchronous.
     """
 
+    # Upper bound on a session's lifetime. Sessions abandoned on an error path
+    # that never reaches get_result are dropped once they are this old.
+    _SESSION_TTL_NS = 600 * 1_000_000_000
+
     @inject
     def __init__(
         self,
@@ -37,6 +41,18 @@ class ScanOrchestrator:
         """Internal helper to retrieve session start data."""
         return self._start_times.get(task_id)
 
+    def _prune_sessions(self, now_ns: int):
+        """
+        Drops sessions older than the TTL. Entries are inserted in start order,
+        so only the oldest ones at the head of the dict need checking.
+        """
+        cutoff = now_ns - self._SESSION_TTL_NS
+        while self._start_times:
+            task_id, data = next(iter(self._start_times.items()))
+            if data["start_ns"] > cutoff:
+                break
+            del self._start_times[task_id]
+
     def prepare_session(
         self,
         is_priority: bool = False,
@@ -46,9 +62,12 @@ class ScanOrchestrator:
         """
         Initializes a new scan session with a unique stream ID.
         """
-        task_id = str(uuid.uuid4())
+        # 128 random bits as 32 hex chars; no UUID object or dashed formatting
+        task_id = os.urandom(16).hex()
+        now_ns = time.time_ns()
+        self._prune_sessions(now_ns)
         self._start_times[task_id] = {
-            "start_ns": time.time_ns(),
+            "start_ns": now_ns,
             "tenant_id": tenant_id,
             "client_ip": client_ip,
         }
@@ -145,7 +164,7 @@ class ScanOrchestrator:
                     task_id=task_id, status=ScanStatus.ERROR, detail="Timeout"
                 )
 
-            data = json.loads(raw_res.decode("utf-8"))
+            data = serialization.loads(raw_res)
             status_str = data.get("status", "ERROR")
             virus_name = data.get("virus")
 
@@ -16,13 +16,20 @@ from ..common.providers import (
     RedisStreamProvider,
     SharedDiskStreamProvider,
 )
-from ..common.queue.provider import RedisQueueProvider, RedisStateStoreProvider
+from ..common.queue.provider import (
+    RedisQueueProvider,
+    RedisSortedSetQueueProvider,
+    RedisStreamQueueProvider,
+    RedisStateStoreProvider,
+)
 from .application.orchestrator import ScanOrchestrator
 from .application.feature_flags import (
     FlagsmithFeatureFlagsProvider,
     EnvVarFeatureFlagsProvider,
 )
+from .infrastructure.key_pool import LeafKeyPool
 from .infrastructure.redis_adapter import RedisScanAdapter
+from .infrastructure.result_listener import RedisResultListener
 from .interfaces.grpc.handler import VirusScannerExtProcHandler
 from .interfaces.grpc.sds import SecretDiscoveryHandler
 from .settings import ProducerSettings
@@ -50,18 +57,84 @@ class ProducerContainer(containers.DeclarativeContainer):
         scan_tmp_dir=config.scan_tmp_dir,
         scan_file_threshold_mb=config.scan_file_threshold_mb,
         grpc_port=config.grpc_port,
+        grpc_max_concurrent_streams=config.grpc_max_concurrent_streams,
+        grpc_keepalive_time_ms=config.grpc_keepalive_time_ms,
+        grpc_keepalive_timeout_ms=config.grpc_keepalive_timeout_ms,
+        producer_workers=config.producer_workers,
+        redis_wait_max_connections=config.redis_wait_max_connections,
+        producer_batch_bytes=config.producer_batch_bytes,
+        local_cache_size=config.local_cache_size,
+        local_cache_ttl=config.local_cache_ttl,
+        sds_key_pool_size=config.sds_key_pool_size,
+        sds_key_pool_workers=config.sds_key_pool_workers,
+    )
+
+    # Bounded pool for short commands (chunk RPUSH, enqueue, cache GET/SET).
+    # A request holds at most one of these at a time and only per command,
+    # so REDIS_MAX_CONNECTIONS bounds commands in flight, not requests; up
+    # to GRPC_MAX_CONCURRENT_STREAMS could contend for it. Bursts beyond it
+    # wait for a connection (no checkout deadline, like redis_blocking_pool)
+    # rather than failing the request; keepalive + health checks catch dead
+    # idle connections
+    redis_pool = providers.Singleton(
+        redis.BlockingConnectionPool,
+        host=settings.provided.redis_host,
+        port=settings.provided.redis_port,
+        max_connections=settings.provided.redis_max_connections,
+        timeout=None,
+        socket_keepalive=True,
+        health_check_interval=30,
+        decode_responses=False,
     )
 
     redis_client = providers.Singleton(
         redis.Redis,
+        connection_pool=redis_pool,
+    )
+
+    # Blocking waits (ACK BRPOPs, the result stream reader) hold a connection
+    # for their whole timeout; their own pool keeps a burst of waits from
+    # starving the short RPUSH/GET traffic on redis_pool. It is sized from
+    # GRPC_MAX_CONCURRENT_STREAMS (REDIS_WAIT_MAX_CONNECTIONS), and checkout
+    # waits without a deadline: a failed checkout would read as a missed
+    # handshake and let the body through unscanned
+    redis_blocking_pool = providers.Singleton(
+        redis.BlockingConnectionPool,
         host=settings.provided.redis_host,
         port=settings.provided.redis_port,
+        max_connections=settings.provided.redis_wait_max_connections,
+        timeout=None,
+        socket_keepalive=True,
+        health_check_interval=30,
         decode_responses=False,
     )
 
-    queue_provider = providers.Singleton(
+    redis_blocking_client = providers.Singleton(
+        redis.Redis,
+        connection_pool=redis_blocking_pool,
+    )
+
+    # Task queue layout; must match the consumer's QUEUE_BACKEND
+    queue_provider = providers.Selector(
+        providers.Callable(os.getenv, "QUEUE_BACKEND", "list"),
+        list=providers.Singleton(
+            RedisQueueProvider,
+            redis_client=redis_client,
+        ),
+        zset=providers.Singleton(
+            RedisSortedSetQueueProvider,
+            redis_client=redis_client,
+        ),
+        stream=providers.Singleton(
+            RedisStreamQueueProvider,
+            redis_client=redis_client,
+        ),
+    )
+
+    # ACK and result keys are plain lists under every QUEUE_BACKEND
+    wait_queue_provider = providers.Singleton(
         RedisQueueProvider,
-        redis_client=redis_client,
+        redis_client=redis_blocking_client,
     )
 
     state_store_provider = providers.Singleton(
@@ -70,16 +143,29 @@ class ProducerContainer(containers.DeclarativeContainer):
     )
 
     data_provider = providers.FactoryAggregate(
-        STREAM=providers.Factory(RedisStreamProvider, redis_client=redis_client),
+        STREAM=providers.Factory(
+            RedisStreamProvider,
+            redis_client=redis_client,
+            batch_bytes=settings.provided.producer_batch_bytes,
+        ),
         PATH=providers.Factory(SharedDiskStreamProvider),
         BODY=providers.Factory(InlineStreamProvider),
     )
 
     # Infrastructure
+    result_listener = providers.Singleton(
+        RedisResultListener,
+        redis_client=redis_blocking_client,
+        channel=settings.provided.result_channel,
+    )
+
     redis_adapter = providers.Singleton(
         RedisScanAdapter,
         queue_provider=queue_provider,
         state_store=state_store_provider,
+        result_listener=result_listener,
+        wait_provider=wait_queue_provider,
+        task_codec=settings.provided.task_codec,
     )
 
     # Application
@@ -120,6 +206,8 @@ class ProducerContainer(containers.DeclarativeContainer):
         provider=state_store_provider,
         policy=bypass_policy,
         file_store=file_store,
+        local_cache_size=settings.provided.local_cache_size,
+        local_cache_ttl=settings.provided.local_cache_ttl,
     )
 
     # Feature Flag Providers
@@ -133,11 +221,23 @@ class ProducerContainer(containers.DeclarativeContainer):
         envvar=providers.Singleton(EnvVarFeatureFlagsProvider),
     )
 
-    # Secret Discovery Handler
+    # Secret Discovery Handler; only RSA leaf keys are slow enough to be
+    # generated ahead of demand (SDS_KEY_ALGO defaults to ecdsa)
+    sds_key_pool = providers.Selector(
+        providers.Callable(os.getenv, "SDS_KEY_ALGO", "ecdsa"),
+        rsa=providers.Singleton(
+            LeafKeyPool,
+            size=settings.provided.sds_key_pool_size,
+            workers=settings.provided.sds_key_pool_workers,
+        ),
+        ecdsa=providers.Object(None),
+    )
+
     sds_handler = providers.Singleton(
         SecretDiscoveryHandler,
         ca_cert_path=config.CA_CERT_PATH,
         ca_key_path=config.CA_KEY_PATH,
+        key_pool=sds_key_pool,
     )
 
     # Interface
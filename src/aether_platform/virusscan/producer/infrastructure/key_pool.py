@@ -0,0 +1,104 @@
+"""
+Leaf key pre-generation for the SDS certificate issuer. Kept free of gRPC and
+Envoy proto imports: pool worker processes are spawned and import this module.
+"""
+
+import logging
+import multiprocessing
+import queue
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Optional
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+logger = logging.getLogger(__name__)
+
+
+def _generate_rsa_key_der(key_size: int) -> bytes:
+    """Runs in a pool process; keys cross the process boundary as DER."""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=key_size)
+    return key.private_bytes(
+        encoding=serialization.Encoding.DER,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+
+
+class LeafKeyPool:
+    """
+    Keeps RSA leaf keys generated ahead of time in worker processes, so a
+    certificate cache miss only has to sign. The pool refills itself once it
+    drops below ``low_water``; an empty pool falls back to inline generation.
+    ``size`` 0 disables pre-generation. Every forked producer worker owns a
+    pool, so ``workers`` is per pool and defaults to one process.
+    """
+
+    def __init__(
+        self,
+        size: int = 32,
+        key_size: int = 2048,
+        low_water: Optional[int] = None,
+        workers: int = 1,
+    ):
+        self.size = size
+        self.key_size = key_size
+        self.low_water = size // 2 if low_water is None else low_water
+        self._keys: queue.Queue = queue.Queue()
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        if size > 0:
+            # spawn: forking a process that already runs gRPC threads is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=max(1, workers),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            self._refill()
+
+    def __len__(self) -> int:
+        return self._keys.qsize()
+
+    def _refill(self):
+        with self._lock:
+            missing = self.size - self._keys.qsize() - self._in_flight
+            if self._executor is None or missing <= 0:
+                return
+            self._in_flight += missing
+        for _ in range(missing):
+            future = self._executor.submit(_generate_rsa_key_der, self.key_size)
+            future.add_done_callback(self._on_generated)
+
+    def _on_generated(self, future: Future):
+        with self._lock:
+            self._in_flight -= 1
+        if future.cancelled() or future.exception() is not None:
+            if not future.cancelled():
+                logger.warning(f"Leaf key generation failed: {future.exception()}")
+            return
+        # Our own freshly generated keys; skip the costly RSA consistency check
+        key = serialization.load_der_private_key(
+            future.result(), password=None, unsafe_skip_rsa_key_validation=True
+        )
+        self._keys.put(key)
+
+    def get(self) -> rsa.RSAPrivateKey:
+        """Hands out a pre-generated key, generating one inline if none is ready."""
+        try:
+            key = self._keys.get_nowait()
+        except queue.Empty:
+            key = None
+        if self._keys.qsize() < self.low_water:
+            self._refill()
+        if key is None:
+            key = rsa.generate_private_key(
+                public_exponent=65537, key_size=self.key_size
+            )
+        return key
+
+    def close(self):
+        """Stops the worker processes; later ``get`` calls generate inline."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -1,11 +1,14 @@
-import json
 import logging
-from typing import Optional
+import time
+from typing import Dict, Optional, Tuple
 
 from dependency_injector.wiring import Provide, inject
 
+from aether_platform.virusscan.common import serialization
 from aether_platform.virusscan.common.queue.provider import (
     QueueProvider, StateStoreProvider)
+from aether_platform.virusscan.producer.infrastructure.result_listener import \
+    RedisResultListener
 
 logger = logging.getLogger(__name__)
 
@@ -16,11 +19,17 @@ class RedisScanAdapter:
     queue communication. Balanced for asynchronous operations.
     """
 
+    # The last TAT only changes once per finished scan; every request reads it
+    _TAT_CACHE_TTL = 0.5
+
     @inject
     def __init__(
         self,
         queue_provider: QueueProvider = Provide["queue_provider"],
         state_store: StateStoreProvider = Provide["state_store_provider"],
+        result_listener: Optional[RedisResultListener] = None,
+        wait_provider: Optional[QueueProvider] = None,
+        task_codec: str = serialization.JSON,
     ):
         """
         Initializes the adapter.
@@ -28,9 +37,19 @@ class RedisScanAdapter:
         Args:
             queue_provider: An abstraction over the PubSub/Key-Value backend.
             state_store: An abstraction over the Key-Value store.
+            result_listener: Shared result subscription. Falls back to a
+                blocking pop per request when omitted.
+            wait_provider: Queue provider for blocking pops (ACK/result waits),
+                typically on its own connection pool. Defaults to queue_provider.
+            task_codec: Encoding for enqueued job metadata (json|msgpack).
         """
         self.provider = queue_provider
         self.store = state_store
+        self.result_listener = result_listener
+        self.wait_provider = wait_provider or queue_provider
+        self.task_codec = task_codec
+        # is_priority -> (expires_at, tat_seconds)
+        self._tat_cache: Dict[bool, Tuple[float, float]] = {}
 
     def _get_result_key(self, task_id: str) -> str:
         """Internal helper to generate the result channel key."""
@@ -50,7 +69,7 @@ class RedisScanAdapter:
         client_ip: str = "unknown",
     ):
         """
-        Pushes a new scan task as JSON job metadata into Redis.
+        Pushes a new scan task as job metadata (JSON or msgpack) into Redis.
 
         Args:
             task_id: Unique identifier for the scan task (Stream ID).
@@ -72,7 +91,7 @@ class RedisScanAdapter:
             "mode": mode,
         }
 
-        payload = json.dumps(job_metadata)
+        payload = serialization.dumps(job_metadata, self.task_codec)
         await self.provider.push(queue_name, payload)
 
     async def record_metrics(self, task_id: str, duration_ms: float):
@@ -92,7 +111,7 @@ class RedisScanAdapter:
         """
         ack_key = f"ack:{task_id}"
         try:
-            res = await self.provider.pop([ack_key], timeout=timeout)
+            res = await self.wait_provider.pop([ack_key], timeout=timeout)
             return bool(res)
         except Exception as e:
             logger.error(f"Error while waiting for ACK {task_id}: {e}")
@@ -101,13 +120,21 @@ class RedisScanAdapter:
     async def get_last_tat(self, is_priority: bool) -> float:
         """
         Retrieves the last recorded TAT (in seconds) for the given priority.
+        Served from a short in-process cache so concurrent requests share one GET.
         """
+        now = time.monotonic()
+        cached = self._tat_cache.get(is_priority)
+        if cached and cached[0] > now:
+            return cached[1]
+
         tat_key = "tat_high_last" if is_priority else "tat_normal_last"
         try:
             val = await self.store.get(tat_key)
-            return float(val) / 1000.0 if val else 0.0
+            tat = float(val) / 1000.0 if val else 0.0
         except Exception:
             return 0.0
+        self._tat_cache[is_priority] = (now + self._TAT_CACHE_TTL, tat)
+        return tat
 
     async def wait_for_result(
         self, task_id: str, timeout: int = 300
@@ -116,7 +143,11 @@ class RedisScanAdapter:
         Blocks asynchronously until a scan result is available for the given task.
         """
         try:
-            res = await self.provider.pop(
+            if self.result_listener:
+                return await self.result_listener.wait(
+                    task_id, self._get_result_key(task_id), timeout
+                )
+            res = await self.wait_provider.pop(
                 [self._get_result_key(task_id)], timeout=timeout
             )
             if res:
@@ -0,0 +1,110 @@
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class RedisResultListener:
+    """
+    Infrastructure component that receives scan results for all in-flight
+    requests from a single Redis Stream reader.
+    Replaces one blocking BRPOP connection per request with in-process futures,
+    and resolves a whole burst of results per XREAD.
+    """
+
+    # Entries fetched per XREAD and how long each read blocks
+    _READ_COUNT = 256
+    _BLOCK_MS = 5000
+
+    def __init__(self, redis_client: Any, channel: str = "scan_results"):
+        """
+        Initializes the listener.
+
+        Args:
+            redis_client: Async Redis client (responses as bytes).
+            channel: Stream consumers append "{task_id}|{result}" entries to.
+        """
+        self.redis = redis_client
+        self.channel = channel
+        self._waiters: Dict[str, asyncio.Future] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._ready: Optional[asyncio.Event] = None
+        # Kept across restarts so a reconnect resumes without skipping entries
+        self._last_id: Optional[bytes] = None
+
+    async def _ensure_started(self):
+        """Starts the reader task on first use and waits until it is live."""
+        if self._task is None or self._task.done():
+            self._ready = asyncio.Event()
+            self._task = asyncio.create_task(self._listen())
+        await self._ready.wait()
+
+    async def _listen(self):
+        try:
+            if self._last_id is None:
+                # Start right after the newest entry; anything appended later
+                # is read, anything earlier is covered by the result list
+                latest = await self.redis.xrevrange(self.channel, count=1)
+                self._last_id = latest[0][0] if latest else b"0-0"
+            self._ready.set()
+            while True:
+                streams = await self.redis.xread(
+                    {self.channel: self._last_id},
+                    count=self._READ_COUNT,
+                    block=self._BLOCK_MS,
+                )
+                for _, entries in streams or ():
+                    for entry_id, fields in entries:
+                        self._last_id = entry_id
+                        task_id, _, payload = fields[b"m"].partition(b"|")
+                        waiter = self._waiters.get(task_id.decode("utf-8"))
+                        if waiter and not waiter.done():
+                            waiter.set_result(payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Result listener stopped: {e}")
+            # Wake everyone so they fall back to polling the result list
+            for waiter in self._waiters.values():
+                if not waiter.done():
+                    waiter.set_exception(ConnectionError(str(e)))
+        finally:
+            self._ready.set()
+
+    async def wait(self, task_id: str, result_key: str, timeout: int) -> Optional[bytes]:
+        """
+        Waits for the result of ``task_id``.
+
+        The result list is checked once the reader is live, since a result
+        appended before its starting position only exists there. If the reader
+        is down the wait degrades to a BRPOP on ``result_key``.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        waiter = loop.create_future()
+        self._waiters[task_id] = waiter
+        try:
+            await self._ensure_started()
+            early = await self.redis.rpop(result_key)
+            if early:
+                return early
+            try:
+                return await asyncio.wait_for(waiter, deadline - loop.time())
+            except asyncio.TimeoutError:
+                return await self.redis.rpop(result_key)
+            except ConnectionError:
+                remaining = max(1, int(deadline - loop.time()))
+                res = await self.redis.brpop([result_key], timeout=remaining)
+                return res[1] if res else None
+        finally:
+            self._waiters.pop(task_id, None)
+
+    async def close(self):
+        """Stops the reader task."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
@@ -34,12 +34,61 @@ def _extract_header_value(header) -> str:
     return header.value
 
 
-def _parse_headers(header_list) -> dict[str, str]:
-    """Parse Envoy HeaderMap into a dict, handling both value and raw_value."""
-    return {
-        h.key.lower(): _extract_header_value(h)
-        for h in header_list
-    }
+def _header_key(key: str) -> str:
+    """Envoy already sends lowercase keys; only allocate a lowered copy if not."""
+    return key if key.islower() else key.lower()
+
+
+# Header names the handler actually reads, per phase
+_REQUEST_HEADER_KEYS = frozenset({":path", ":method"})
+_RESPONSE_HEADER_KEYS = frozenset({"content-type"})
+
+
+def _parse_headers(header_list, wanted: frozenset[str]) -> dict[str, str]:
+    """
+    Parse the ``wanted`` entries of an Envoy HeaderMap into a dict, handling
+    both value and raw_value. Other headers are never decoded, and the scan
+    stops once every wanted key has been seen.
+    """
+    headers = {}
+    for h in header_list:
+        key = _header_key(h.key)
+        if key in wanted and key not in headers:
+            headers[key] = _extract_header_value(h)
+            if len(headers) == len(wanted):
+                break
+    return headers
+
+
+# CONTINUE responses are never mutated, so one instance per (phase, headers/body)
+# is shared by every stream instead of being rebuilt per message.
+_CONTINUE_RESPONSES = {
+    (True, True): external_processor_pb2.ProcessingResponse(
+        request_headers=external_processor_pb2.HeadersResponse()
+    ),
+    (False, True): external_processor_pb2.ProcessingResponse(
+        response_headers=external_processor_pb2.HeadersResponse()
+    ),
+    (True, False): external_processor_pb2.ProcessingResponse(
+        request_body=external_processor_pb2.BodyResponse()
+    ),
+    (False, False): external_processor_pb2.ProcessingResponse(
+        response_body=external_processor_pb2.BodyResponse()
+    ),
+}
+
+# Known-infected 403: only the virus name varies between responses
+_BLOCKED_STATUS = http_status_pb2.HttpStatus(code=403)
+_BLOCKED_BODY_PREFIX = b"Blocked: known infected resource ("
+
+
+def _blocked_response(virus_name: bytes) -> external_processor_pb2.ProcessingResponse:
+    return external_processor_pb2.ProcessingResponse(
+        immediate_response=external_processor_pb2.ImmediateResponse(
+            status=_BLOCKED_STATUS,
+            body=b"".join((_BLOCKED_BODY_PREFIX, virus_name, b")")),
+        )
+    )
 
 
 class VirusScannerExtProcHandler(external_processor_pb2_grpc.ExternalProcessorServicer):
@@ -65,22 +114,7 @@ class VirusScannerExtProcHandler(external_processor_pb2_grpc.ExternalProcessorSe
     def _continue_response(
         self, is_request_phase: bool, phase: str
     ) -> external_processor_pb2.ProcessingResponse:
-        if phase == "headers":
-            if is_request_phase:
-                return external_processor_pb2.ProcessingResponse(
-                    request_headers=external_processor_pb2.HeadersResponse()
-                )
-            return external_processor_pb2.ProcessingResponse(
-                response_headers=external_processor_pb2.HeadersResponse()
-            )
-        else:  # body
-            if is_request_phase:
-                return external_processor_pb2.ProcessingResponse(
-                    request_body=external_processor_pb2.BodyResponse()
-                )
-            return external_processor_pb2.ProcessingResponse(
-                response_body=external_processor_pb2.BodyResponse()
-            )
+        return _CONTINUE_RESPONSES[(is_request_phase, phase == "headers")]
 
     async def _get_tenant_plan_priority(self, tenant_id: str) -> bool:
         """Returns True if the tenant has high priority."""
@@ -102,8 +136,11 @@ class VirusScannerExtProcHandler(external_processor_pb2_grpc.ExternalProcessorSe
         Infected results are logged and cached to block future requests.
         """
         try:
-            await provider.finalize_push()
-            await self.orchestrator.finalize_ingest(task_id)
+            # Independent writes (done marker, ingest metric): overlap the RTTs
+            await asyncio.gather(
+                provider.finalize_push(),
+                self.orchestrator.finalize_ingest(task_id),
+            )
 
             if handshake_task:
                 is_accepted = await handshake_task
@@ -169,15 +206,16 @@ class VirusScannerExtProcHandler(external_processor_pb2_grpc.ExternalProcessorSe
         ACTIVE_SESSIONS.inc()
         try:
             async for request in request_iterator:
-                logger.debug(f"Received gRPC Request: {request.WhichOneof('request')}")
+                # One oneof lookup per message instead of a HasField per branch
+                kind = request.WhichOneof("request")
+                logger.debug("Received gRPC Request: %s", kind)
 
                 # 1. Header Phase
-                if request.HasField("request_headers") or request.HasField(
-                    "response_headers"
-                ):
-                    if request.HasField("request_headers"):
+                if kind == "request_headers" or kind == "response_headers":
+                    if kind == "request_headers":
                         headers = _parse_headers(
-                            request.request_headers.headers.headers
+                            request.request_headers.headers.headers,
+                            _REQUEST_HEADER_KEYS,
                         )
                         current_path = headers.get(":path", "unknown")
                         current_method = headers.get(":method", "GET").upper()
@@ -185,33 +223,39 @@ class VirusScannerExtProcHandler(external_processor_pb2_grpc.ExternalProcessorSe
                         logger.info(f"[HEADER] Request: {current_method} {current_path}")
                     else:
                         headers = _parse_headers(
-                            request.response_headers.headers.headers
+                            request.response_headers.headers.headers,
+                            _RESPONSE_HEADER_KEYS,
                         )
                         is_request_phase = False
                         content_type = headers.get("content-type")
                         logger.info(f"[HEADER] Response (content-type={content_type})")
 
-                    # Infected cache check — block and renew TTL on every access
+                    # Infected + clean cache checks share one round-trip;
+                    # infected entries block and renew TTL on every access
+                    cache_hit = False
                     if is_request_phase:
-                        virus_name = await self.cache.check_infected(current_path)
+                        is_cacheable = current_method in self._CACHEABLE_METHODS
+                        virus_name, cache_hit = await self.cache.lookup(
+                            current_path, check_clean=is_cacheable
+                        )
                         if virus_name:
+                            # Redis returns the verdict as bytes: reuse them for
+                            # the body and decode once for the log line
+                            if isinstance(virus_name, str):
+                                virus_name = virus_name.encode()
                             logger.warning(
-                                f"BLOCKED (infected cache): {virus_name} "
+                                f"BLOCKED (infected cache): "
+                                f"{virus_name.decode('utf-8', 'replace')} "
                                 f"[{current_method} {current_path}]"
                             )
                             await self.cache.store_infected(current_path, virus_name)
                             REQUESTS_TOTAL.labels(method=current_method, result="blocked_infected").inc()
-                            yield external_processor_pb2.ProcessingResponse(
-                                immediate_response=external_processor_pb2.ImmediateResponse(
-                                    status=http_status_pb2.HttpStatus(code=403),
-                                    body=f"Blocked: known infected resource ({virus_name})".encode(),
-                                )
-                            )
+                            yield _blocked_response(virus_name)
                             return
 
                     # Clean cache check only for request headers of cacheable methods
-                    if is_request_phase and current_method in self._CACHEABLE_METHODS:
-                        if await self.cache.check_cache(current_path):
+                    if is_request_phase and is_cacheable:
+                        if cache_hit:
                             logger.info(f"CACHE HIT: {current_method} {current_path}")
                             CACHE_OPS.labels(operation="hit").inc()
                             SCAN_SESSIONS.labels(result="cache_hit").inc()
@@ -265,10 +309,9 @@ class VirusScannerExtProcHandler(external_processor_pb2_grpc.ExternalProcessorSe
                 # 2. Body Phase — fire-and-forget streaming
                 # ボディチャンクは即座に CONTINUE を返し、スキャンはバックグラウンドで実行。
                 # ヘッダーフェーズでのハンドシェイクのみブロッキング。
-                elif request.HasField("request_body") or request.HasField(
-                    "response_body"
-                ):
-                    logger.debug(f"[BODY] Phase (is_bypassed={is_bypassed})")
+                elif kind == "request_body" or kind == "response_body":
+                    # Lazy %-formatting: runs once per body chunk, almost always below DEBUG
+                    logger.debug("[BODY] Phase (is_bypassed=%s)", is_bypassed)
 
                     # Immediately CONTINUE — never block on body chunks
                     yield self._continue_response(is_request_phase, phase="body")
@@ -278,7 +321,7 @@ class VirusScannerExtProcHandler(external_processor_pb2_grpc.ExternalProcessorSe
 
                     body_field = (
                         request.request_body
-                        if request.HasField("request_body")
+                        if kind == "request_body"
                         else request.response_body
                     )
 
@@ -1,3 +1,4 @@
+import asyncio
 import datetime
 import logging
 import os
@@ -5,12 +6,12 @@ import threading
 import time
 import uuid
 from collections import OrderedDict
-from typing import AsyncIterator, NamedTuple
+from typing import AsyncIterator, NamedTuple, Optional
 
 import grpc
 from cryptography import x509
 from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
 from cryptography.x509.oid import NameOID
 from envoy.config.core.v3 import base_pb2
 from envoy.extensions.transport_sockets.tls.v3 import common_pb2, secret_pb2
@@ -18,6 +19,7 @@ from envoy.service.discovery.v3 import discovery_pb2
 from envoy.service.secret.v3 import sds_pb2_grpc
 from google.protobuf import any_pb2
 
+from aether_platform.virusscan.producer.infrastructure.key_pool import LeafKeyPool
 from aether_platform.virusscan.producer.metrics import SDS_CERTS_GENERATED, SDS_ERRORS
 
 logger = logging.getLogger(__name__)
@@ -25,6 +27,8 @@ logger = logging.getLogger(__name__)
 # Default: cache up to 1000 certs, each valid for 1 hour
 _DEFAULT_CACHE_MAX_SIZE = int(os.environ.get("SDS_CACHE_MAX_SIZE", "1000"))
 _DEFAULT_CACHE_TTL_SECONDS = int(os.environ.get("SDS_CACHE_TTL_SECONDS", "3600"))
+# Leaf key type: "ecdsa" (P-256) or "rsa" (2048-bit, for legacy clients)
+_DEFAULT_KEY_ALGO = os.environ.get("SDS_KEY_ALGO", "ecdsa")
 
 
 class _CachedCert(NamedTuple):
@@ -37,7 +41,7 @@ class _CachedCert(NamedTuple):
 class SecretDiscoveryHandler(sds_pb2_grpc.SecretDiscoveryServiceServicer):
     """
     SDS server implementation for on-demand dynamic certificate generation.
-    Includes an LRU cache to avoid redundant RSA key generation.
+    Includes an LRU cache to avoid redundant key generation.
     """
 
     def __init__(
@@ -46,19 +50,29 @@ class SecretDiscoveryHandler(sds_pb2_grpc.SecretDiscoveryServiceServicer):
         ca_key_path: str,
         cache_max_size: int = _DEFAULT_CACHE_MAX_SIZE,
         cache_ttl_seconds: int = _DEFAULT_CACHE_TTL_SECONDS,
+        key_pool: Optional[LeafKeyPool] = None,
+        key_algo: str = _DEFAULT_KEY_ALGO,
     ):
         self.ca_cert_path = ca_cert_path
         self.ca_key_path = ca_key_path
+        self.key_pool = key_pool
+        if key_algo not in ("ecdsa", "rsa"):
+            raise ValueError(f"Unsupported SDS key algorithm: {key_algo}")
+        self.key_algo = key_algo
         self._cache: OrderedDict[str, _CachedCert] = OrderedDict()
         self._cache_max_size = cache_max_size
         self._cache_ttl = cache_ttl_seconds
         self._cache_lock = threading.Lock()
+        # Misses being generated right now; later requests for the name join them
+        self._inflight: dict[str, asyncio.Future] = {}
         self._load_ca()
 
     def _load_ca(self):
         try:
             with open(self.ca_cert_path, "rb") as f:
                 self.ca_cert = x509.load_pem_x509_certificate(f.read())
+            # The chain served with every leaf is invariant; encode it once
+            self.chain_pem = self.ca_cert.public_bytes(serialization.Encoding.PEM)
             with open(self.ca_key_path, "rb") as f:
                 self.ca_key = serialization.load_pem_private_key(f.read(), password=None)
             logger.info(f"Loaded Intermediate CA: {self.ca_cert.subject.get_attributes_for_oid(NameOID.COMMON_NAME)[0].value}")
@@ -90,16 +104,25 @@ class SecretDiscoveryHandler(sds_pb2_grpc.SecretDiscoveryServiceServicer):
                 while len(self._cache) > self._cache_max_size:
                     self._cache.popitem(last=False)
 
+    def _new_leaf_key(self) -> ec.EllipticCurvePrivateKey | rsa.RSAPrivateKey:
+        # P-256 keygen and signing are an order of magnitude cheaper than
+        # RSA-2048, and the handshake carries a far smaller public key
+        if self.key_algo == "ecdsa":
+            return ec.generate_private_key(ec.SECP256R1())
+        if self.key_pool is not None:
+            return self.key_pool.get()
+        return rsa.generate_private_key(
+            public_exponent=65537,
+            key_size=2048,
+        )
+
     def _generate_cert(self, common_name: str) -> tuple[bytes, bytes, bytes]:
         """Generates a site-specific certificate signed by the Intermediate CA, with caching."""
         cached = self._get_cached_cert(common_name)
         if cached is not None:
             return cached.cert_pem, cached.key_pem, cached.chain_pem
 
-        private_key = rsa.generate_private_key(
-            public_exponent=65537,
-            key_size=2048,
-        )
+        private_key = self._new_leaf_key()
 
         subject = x509.Name([
             x509.NameAttribute(NameOID.COMMON_NAME, common_name),
@@ -134,7 +157,7 @@ class SecretDiscoveryHandler(sds_pb2_grpc.SecretDiscoveryServiceServicer):
         )
 
         # Also need the chain (Intermediate CA)
-        chain_pem = self.ca_cert.public_bytes(serialization.Encoding.PEM)
+        chain_pem = self.chain_pem
 
         self._put_cached_cert(
             common_name,
@@ -143,6 +166,25 @@ class SecretDiscoveryHandler(sds_pb2_grpc.SecretDiscoveryServiceServicer):
 
         return cert_pem, key_pem, chain_pem
 
+    async def _resolve_secret(self, name: str) -> discovery_pb2.Resource:
+        """
+        Builds the secret for ``name``. Cache misses are signed in a worker
+        thread, once per name however many streams ask for it concurrently.
+        """
+        if self._get_cached_cert(name) is None:
+            pending = self._inflight.get(name)
+            if pending is None:
+                # Key generation and signing (tens of milliseconds with RSA) would
+                # otherwise stall every ext_proc stream sharing this event loop
+                pending = asyncio.ensure_future(
+                    asyncio.to_thread(self._generate_cert, name)
+                )
+                self._inflight[name] = pending
+                pending.add_done_callback(lambda _: self._inflight.pop(name, None))
+            # Shielded: one cancelled stream must not abort the others' cert
+            await asyncio.shield(pending)
+        return self._build_tls_certificate_secret(name)
+
     async def FetchSecrets(self, request, context):
         raise NotImplementedError("Use StreamSecrets for SDS")
 
@@ -159,7 +201,7 @@ class SecretDiscoveryHandler(sds_pb2_grpc.SecretDiscoveryServiceServicer):
             resources = []
             for name in resource_names:
                 try:
-                    resource = self._build_tls_certificate_secret(name)
+                    resource = await self._resolve_secret(name)
                     any_secret = resource.resource
                     resources.append(any_secret)
                     SDS_CERTS_GENERATED.inc()
@@ -222,7 +264,7 @@ class SecretDiscoveryHandler(sds_pb2_grpc.SecretDiscoveryServiceServicer):
             resources = []
             for name in subscribe:
                 try:
-                    resource = self._build_tls_certificate_secret(name)
+                    resource = await self._resolve_secret(name)
                     resources.append(resource)
                     SDS_CERTS_GENERATED.inc()
                     logger.info(f"DeltaSDS: generated cert for {name}")
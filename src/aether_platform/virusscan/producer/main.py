@@ -1,7 +1,7 @@
-import asyncio
 import importlib
 import logging
 import os
+import signal
 import sys
 
 import grpc.aio as grpc
@@ -46,6 +46,7 @@ def load_all_pb2():
 
     # Try multiple passes to handle dependencies
     loaded_set = set()
+    failures = {}
     for _ in range(5):
         pass_count = 0
         for mod_name in sorted(modules_to_load):
@@ -54,19 +55,31 @@ def load_all_pb2():
             try:
                 importlib.import_module(mod_name)
                 loaded_set.add(mod_name)
+                failures.pop(mod_name, None)
                 pass_count += 1
-            except Exception:
-                pass
+            except Exception as e:
+                failures[mod_name] = e
         if pass_count == 0:
             break
 
+    for mod_name, error in sorted(failures.items()):
+        logging.getLogger(__name__).warning(
+            f"Proto module {mod_name} failed to load: {error}"
+        )
+
 
 load_all_pb2()
 # -----------------------------
 # Proto stubs must be loaded before importing modules that depend on them.
 
-from envoy.service.ext_proc.v3 import external_processor_pb2_grpc  # noqa: E402
+try:
+    from envoy.service.ext_proc.v3 import external_processor_pb2_grpc  # noqa: E402
+except ImportError as e:
+    raise SystemExit(
+        f"Envoy ext_proc stubs are missing ({e}); run generate_protos.sh"
+    ) from e
 
+from aether_platform.virusscan.common import event_loop  # noqa: E402
 from aether_platform.virusscan.producer.containers import ProducerContainer  # noqa: E402
 from aether_platform.virusscan.producer.interfaces.grpc.handler import (  # noqa: E402
     VirusScannerExtProcHandler,
@@ -74,6 +87,7 @@ from aether_platform.virusscan.producer.interfaces.grpc.handler import (  # noqa
 from aether_platform.virusscan.producer.interfaces.grpc.sds import (  # noqa: E402
     SecretDiscoveryHandler,
 )
+from aether_platform.virusscan.producer.settings import ProducerSettings  # noqa: E402
 
 logger = logging.getLogger(__name__)
 
@@ -81,15 +95,21 @@ logger = logging.getLogger(__name__)
 async def serve(
     handler: VirusScannerExtProcHandler = Provide[ProducerContainer.grpc_handler],
     sds_handler: SecretDiscoveryHandler = Provide[ProducerContainer.sds_handler],
-    grpc_port: int = Provide[ProducerContainer.settings.provided.grpc_port],
+    settings: ProducerSettings = Provide[ProducerContainer.settings],
+    worker_index: int = 0,
 ):
     """Starts the VirusScanner Producer (Async gRPC + Prometheus metrics)."""
-    # Start Prometheus metrics HTTP server (avoid 8080/8443 used by Envoy sidecar)
-    metrics_port = int(os.environ.get("METRICS_PORT", "9090"))
+    # Start Prometheus metrics HTTP server (avoid 8080/8443 used by Envoy sidecar).
+    # Forked workers each expose their own registry on consecutive ports
+    # (METRICS_PORT + worker index); scrape configs must cover all of them.
+    metrics_port = int(os.environ.get("METRICS_PORT", "9090")) + worker_index
     start_http_server(metrics_port)
     logger.info(f"Prometheus metrics server started on port {metrics_port}")
 
-    server = grpc.server()
+    grpc_port = settings.grpc_port
+    options = settings.grpc_server_options()
+    logger.info(f"gRPC server options: {dict(options)}")
+    server = grpc.server(options=options)
     logger.info(f"Registering ExternalProcessor handler: {handler}")
     external_processor_pb2_grpc.add_ExternalProcessorServicer_to_server(handler, server)
     from envoy.service.secret.v3 import sds_pb2_grpc
@@ -101,22 +121,87 @@ async def serve(
         f"Starting Advanced VirusScanner Producer (Async gRPC) on port {grpc_port}..."
     )
     await server.start()
-    await server.wait_for_termination()
+    try:
+        await server.wait_for_termination()
+    finally:
+        # Leaf key generation runs in spawned processes of its own
+        if sds_handler.key_pool is not None:
+            sds_handler.key_pool.close()
 
 
-def main():
-    logging.basicConfig(
-        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
-    )
-
+def _run_worker(worker_index: int = 0):
+    """Builds the container and runs one server process."""
     container = ProducerContainer()
     container.wire(modules=[__name__])
 
     try:
-        asyncio.run(serve())
+        event_loop.run(serve(worker_index=worker_index))
     except KeyboardInterrupt:
         pass
 
 
+def main():
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+
+    # Only the settings are resolved here; nothing that opens a connection
+    workers = ProducerContainer().settings().producer_workers
+    if workers <= 1:
+        _run_worker()
+        return
+
+    # Fork before any Redis connection or gRPC server exists; each child builds
+    # its own container and the kernel balances connections via SO_REUSEPORT
+    logger.info(f"Starting {workers} producer worker processes")
+    children = []
+    for index in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            status = 1
+            try:
+                _run_worker(index)
+                status = 0
+            except Exception:
+                logger.exception(f"Producer worker {index} failed")
+            finally:
+                os._exit(status)
+        children.append(pid)
+
+    stopping = False
+
+    def forward_signal(signum, _frame):
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, forward_signal)
+    signal.signal(signal.SIGINT, forward_signal)
+
+    # A worker dying on its own takes the rest down with a non-zero exit, so
+    # the orchestrator restarts the pod instead of it running under capacity
+    failed = False
+    remaining = set(children)
+    while remaining:
+        pid, status = os.wait()
+        if pid not in remaining:
+            continue
+        remaining.discard(pid)
+        code = os.waitstatus_to_exitcode(status)
+        if code != 0 and not stopping:
+            logger.error(
+                f"Producer worker (pid {pid}) exited with status {code}; "
+                "stopping the remaining workers"
+            )
+            failed = True
+            forward_signal(signal.SIGTERM, None)
+    if failed:
+        sys.exit(1)
+
+
 if __name__ == "__main__":
     main()
@@ -1,6 +1,6 @@
 import os
 
-from ..common.settings import BaseSettings
+from ..common.settings import BaseSettings, env_number
 
 
 class ProducerSettings(BaseSettings):
@@ -14,20 +14,91 @@ class ProducerSettings(BaseSettings):
         scan_file_threshold_mb: int = None,
         grpc_port: int = None,
         tenant_id: str = None,
+        grpc_max_concurrent_streams: int = None,
+        grpc_keepalive_time_ms: int = None,
+        grpc_keepalive_timeout_ms: int = None,
+        producer_workers: int = None,
+        redis_wait_max_connections: int = None,
+        producer_batch_bytes: int = None,
+        local_cache_size: int = None,
+        local_cache_ttl: float = None,
+        sds_key_pool_size: int = None,
+        sds_key_pool_workers: int = None,
     ):
         super().__init__(
             redis_host=redis_host, redis_port=redis_port, scan_tmp_dir=scan_tmp_dir
         )
+        self.scan_file_threshold_mb = env_number(
+            scan_file_threshold_mb, "SCAN_FILE_THRESHOLD_MB", 10
+        )
+
+        # Body bytes buffered before chunks are flushed to Redis in one RPUSH
+        self.producer_batch_bytes = env_number(
+            producer_batch_bytes, "PRODUCER_BATCH_BYTES", 64 * 1024
+        )
+
+        self.grpc_port = env_number(grpc_port, "GRPC_PORT", 50051)
+
+        # HTTP/2 limits for the ext_proc server; Envoy multiplexes many
+        # requests over few connections, so the per-connection stream cap matters
+        self.grpc_max_concurrent_streams = env_number(
+            grpc_max_concurrent_streams, "GRPC_MAX_CONCURRENT_STREAMS", 1000
+        )
+        # Each in-flight request holds one blocking-pool connection for its
+        # whole ACK wait, so the pool covers every stream this process may
+        # serve, plus the shared result stream reader
+        self.redis_wait_max_connections = env_number(
+            redis_wait_max_connections,
+            "REDIS_WAIT_MAX_CONNECTIONS",
+            self.grpc_max_concurrent_streams + 1,
+        )
+
+        self.grpc_keepalive_time_ms = env_number(
+            grpc_keepalive_time_ms, "GRPC_KEEPALIVE_TIME_MS", 30000
+        )
+
+        # A keepalive ping unanswered for this long closes the connection, so
+        # streams from a vanished Envoy are reclaimed instead of lingering
+        self.grpc_keepalive_timeout_ms = env_number(
+            grpc_keepalive_timeout_ms, "GRPC_KEEPALIVE_TIMEOUT_MS", 10000
+        )
+
+        # In-process verdict cache in front of the Redis clean/infected keys
+        self.local_cache_size = env_number(local_cache_size, "LOCAL_CACHE_SIZE", 10000)
+        self.local_cache_ttl = env_number(
+            local_cache_ttl, "LOCAL_CACHE_TTL", 30.0, cast=float
+        )
+
+        self.tenant_id = tenant_id or os.getenv("TENANT_ID", "default-tenant")
+
+        # Forked server processes sharing the gRPC port via SO_REUSEPORT
+        # ("auto" = one per CPU)
+        workers = producer_workers or os.getenv("PRODUCER_WORKERS", 1)
         try:
-            self.scan_file_threshold_mb = int(
-                scan_file_threshold_mb or os.getenv("SCAN_FILE_THRESHOLD_MB", 10)
+            self.producer_workers = (
+                (os.cpu_count() or 1) if workers == "auto" else max(1, int(workers))
             )
         except (ValueError, TypeError):
-            self.scan_file_threshold_mb = 10
+            self.producer_workers = 1
 
-        try:
-            self.grpc_port = int(grpc_port or os.getenv("GRPC_PORT", 50051))
-        except (ValueError, TypeError):
-            self.grpc_port = 50051
+        # RSA leaf keys kept ready for SDS certificate misses (0 disables),
+        # and the key generation processes of each producer worker; the CPUs
+        # are split between workers so "auto" does not spawn cpu_count**2
+        self.sds_key_pool_size = env_number(sds_key_pool_size, "SDS_KEY_POOL_SIZE", 32)
+        self.sds_key_pool_workers = env_number(
+            sds_key_pool_workers,
+            "SDS_KEY_POOL_WORKERS",
+            max(1, (os.cpu_count() or 1) // self.producer_workers),
+        )
 
-        self.tenant_id = tenant_id or os.getenv("TENANT_ID", "default-tenant")
+    def grpc_server_options(self) -> list[tuple[str, int]]:
+        """Channel arguments for the async gRPC server."""
+        return [
+            ("grpc.max_concurrent_streams", self.grpc_max_concurrent_streams),
+            ("grpc.keepalive_time_ms", self.grpc_keepalive_time_ms),
+            ("grpc.keepalive_timeout_ms", self.grpc_keepalive_timeout_ms),
+            # Probe idle Envoy connections too, not only ones with open streams
+            ("grpc.keepalive_permit_without_calls", 1),
+            ("grpc.http2.max_pings_without_data", 0),
+            ("grpc.so_reuseport", 1 if self.producer_workers > 1 else 0),
+        ]
@@ -0,0 +1,46 @@
+import datetime
+
+import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+
+
+@pytest.fixture(scope="session")
+def ca_material():
+    """Intermediate test CA as (cert_pem, key_pem); one RSA keygen per session."""
+    ca_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    subject = issuer = x509.Name([
+        x509.NameAttribute(NameOID.COMMON_NAME, "test-intermediate-ca"),
+    ])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    ca_cert = (
+        x509.CertificateBuilder()
+        .subject_name(subject)
+        .issuer_name(issuer)
+        .public_key(ca_key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+        .sign(ca_key, hashes.SHA256())
+    )
+    return (
+        ca_cert.public_bytes(serialization.Encoding.PEM),
+        ca_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.TraditionalOpenSSL,
+            encryption_algorithm=serialization.NoEncryption(),
+        ),
+    )
+
+
+@pytest.fixture(scope="session")
+def ca_paths(ca_material, tmp_path_factory):
+    """The test CA written to files; the directory is unique per xdist worker."""
+    ca_dir = tmp_path_factory.mktemp("ca")
+    cert_path, key_path = ca_dir / "ca.crt", ca_dir / "ca.key"
+    cert_path.write_bytes(ca_material[0])
+    key_path.write_bytes(ca_material[1])
+    return str(cert_path), str(key_path)
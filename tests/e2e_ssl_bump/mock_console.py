@@ -2,18 +2,26 @@
 
 import json
 import threading
-from http.server import BaseHTTPRequestHandler, HTTPServer
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
-_logs: list[str] = []
+# GET /logs body kept pre-serialized: each POST appends one encoded entry,
+# so a poll copies bytes instead of re-encoding every stored payload
+_logs_json = bytearray(b"[")
 _lock = threading.Lock()
 
 
 class Handler(BaseHTTPRequestHandler):
+    # Buffer the response so headers and body leave in one send() at finish()
+    wbufsize = 64 * 1024
+
     def do_POST(self):
         length = int(self.headers.get("Content-Length", 0))
         body = self.rfile.read(length).decode("utf-8", errors="replace") if length else ""
+        entry = json.dumps(body).encode()
         with _lock:
-            _logs.append(body)
+            if len(_logs_json) > 1:
+                _logs_json.extend(b",")
+            _logs_json.extend(entry)
         self.send_response(200)
         self.send_header("Content-Type", "application/json")
         self.end_headers()
@@ -21,17 +29,18 @@ class Handler(BaseHTTPRequestHandler):
 
     def do_GET(self):
         with _lock:
-            payload = json.dumps(_logs)
+            payload = _logs_json + b"]"
         self.send_response(200)
         self.send_header("Content-Type", "application/json")
         self.end_headers()
-        self.wfile.write(payload.encode())
+        self.wfile.write(payload)
 
     def log_message(self, fmt, *args):
         print(f"[mock-console] {fmt % args}")
 
 
 if __name__ == "__main__":
-    server = HTTPServer(("0.0.0.0", 80), Handler)
+    # Concurrent webhook POSTs and GET /logs polls must not queue behind each other
+    server = ThreadingHTTPServer(("0.0.0.0", 80), Handler)
     print("[mock-console] Listening on :80")
     server.serve_forever()
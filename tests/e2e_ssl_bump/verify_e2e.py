@@ -23,7 +23,7 @@ async def verify_e2e():
 
     await get_redis_info()
 
-    async with httpx.AsyncClient(verify=False, timeout=30.0) as client:
+    async def test_clean(client: httpx.AsyncClient):
         # [Test 1] Sending Clean File
         logger.info("[Test 1] Sending Clean File...")
         try:
@@ -42,8 +42,7 @@ async def verify_e2e():
         except Exception as e:
             logger.error(f"Test 1 Error: {e}")
 
-        await get_redis_info()
-
+    async def test_infected(client: httpx.AsyncClient):
         # [Test 2] Sending Infected File (EICAR)
         # Infected files cause connection reset (ext_proc aborts the gRPC stream).
         logger.info("[Test 2] Sending Infected File (EICAR)...")
@@ -73,15 +72,25 @@ async def verify_e2e():
         except Exception as e:
             logger.warning(f"Test 2: Unexpected error type {type(e).__name__}: {e}")
 
+    async with httpx.AsyncClient(verify=False, timeout=30.0) as client:
+        # Tests 1 and 2 are independent requests: issue them concurrently
+        await asyncio.gather(test_clean(client), test_infected(client))
+
         await get_redis_info()
 
         # [Test 3] Webhook Verification
+        # Poll instead of a fixed sleep: done as soon as the webhook lands
         logger.info("[Test 3] Verifying Webhook Notification...")
-        await asyncio.sleep(5)  # Wait for async processing
+        found = False
         try:
-            resp = await client.get("http://localhost:3001/logs")
+            for _ in range(50):
+                resp = await client.get("http://localhost:3001/logs")
+                if "e2e-test-tenant" in resp.text:
+                    found = True
+                    break
+                await asyncio.sleep(0.1)
             logger.info(f"Mock Console logs length: {len(resp.text)}")
-            if "e2e-test-tenant" in resp.text:
+            if found:
                 logger.info("SUCCESS: Webhook notification verified.")
             else:
                 logger.error(
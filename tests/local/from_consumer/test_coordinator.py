@@ -0,0 +1,92 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from aether_platform.virusscan.consumer.infrastructure.coordinator import \
+    ClusterCoordinator
+
+
+@pytest.fixture
+def mock_pipeline():
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=[True, 1, [None, None]])
+    return pipe
+
+
+@pytest.fixture
+def mock_state_store(mock_pipeline):
+    store = AsyncMock()
+    store.pipeline = MagicMock(return_value=mock_pipeline)
+    return store
+
+
+@pytest.fixture
+def coordinator(mock_state_store):
+    return ClusterCoordinator(
+        queue_provider=AsyncMock(),
+        state_store=mock_state_store,
+        clamd_url="tcp://localhost:3310",
+    )
+
+
+@pytest.mark.asyncio
+async def test_sync_cluster_state_single_round_trip(
+    coordinator, mock_state_store, mock_pipeline
+):
+    """Heartbeat and reload check are sent through one pipeline execution."""
+    await coordinator.sync_cluster_state()
+
+    mock_pipeline.set.assert_called_once()
+    mock_pipeline.sadd.assert_called_once_with("clamav:active_nodes", coordinator.pod_name)
+    mock_pipeline.mget.assert_called_once_with(
+        "clamav:target_epoch", "clamav:target_epoch_updated_at"
+    )
+    mock_pipeline.execute.assert_awaited_once()
+    # The target epoch came from the pipeline, not a separate MGET
+    mock_state_store.mget.assert_not_called()
+    assert coordinator.last_heartbeat > 0
+
+
+@pytest.mark.asyncio
+async def test_sync_cluster_state_skips_recent_heartbeat(
+    coordinator, mock_pipeline
+):
+    """Within the heartbeat interval only the reload check is queued."""
+    mock_pipeline.execute.return_value = [[None, None]]
+    coordinator.last_heartbeat = float("inf")
+
+    await coordinator.sync_cluster_state()
+
+    mock_pipeline.set.assert_not_called()
+    mock_pipeline.mget.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_active_node_count_single_mget(coordinator, mock_state_store):
+    """Node heartbeats are fetched with one MGET and stale nodes pruned at once."""
+    mock_state_store.smembers.return_value = {b"pod-a", b"pod-b", b"pod-c"}
+    live = {"clamav:heartbeat:pod-a": b"1|0"}
+    mock_state_store.mget.side_effect = lambda *keys: [live.get(k) for k in keys]
+
+    assert await coordinator._get_active_node_count() == 1
+
+    mock_state_store.mget.assert_awaited_once()
+    mock_state_store.get.assert_not_called()
+    (name, *stale), _ = mock_state_store.srem.call_args
+    assert name == "clamav:active_nodes"
+    assert sorted(stale) == ["pod-b", "pod-c"]
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_ttl_follows_interval(mock_state_store, mock_pipeline):
+    """The heartbeat key outlives one missed beat at the configured interval."""
+    coordinator = ClusterCoordinator(
+        queue_provider=AsyncMock(),
+        state_store=mock_state_store,
+        clamd_url="tcp://localhost:3310",
+        heartbeat_interval=5.0,
+    )
+
+    await coordinator.sync_cluster_state()
+
+    assert mock_pipeline.set.call_args.kwargs["ex"] == 10
@@ -0,0 +1,95 @@
+import asyncio
+import struct
+
+import pytest
+
+from aether_platform.virusscan.common.providers import InlineStreamProvider
+from aether_platform.virusscan.consumer.infrastructure.engine_client import \
+    ScannerEngineClient
+
+
+async def _fake_clamd(connections: list):
+    """Minimal clamd speaking IDSESSION + INSTREAM; infected if body has EICAR."""
+
+    async def handle(reader, writer):
+        connections.append(writer)
+        assert await reader.readuntil(b"\0") == b"zIDSESSION\0"
+        request_id = 0
+        while True:
+            try:
+                command = await reader.readuntil(b"\0")
+            except asyncio.IncompleteReadError:
+                break
+            if command == b"zEND\0":
+                break
+            request_id += 1
+            body = b""
+            while True:
+                (size,) = struct.unpack("!I", await reader.readexactly(4))
+                if size == 0:
+                    break
+                body += await reader.readexactly(size)
+            verdict = "Eicar-Test-Signature FOUND" if b"EICAR" in body else "OK"
+            writer.write(f"{request_id}: stream: {verdict}\0".encode())
+            await writer.drain()
+        writer.close()
+
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+
+@pytest.mark.asyncio
+async def test_scan_reuses_session():
+    """Consecutive scans share one clamd connection."""
+    connections = []
+    server = await _fake_clamd(connections)
+    port = server.sockets[0].getsockname()[1]
+    client = ScannerEngineClient(f"tcp://127.0.0.1:{port}")
+    try:
+        clean = await client.scan(InlineStreamProvider(b"hello"))
+        infected = await client.scan(InlineStreamProvider(b"xx EICAR xx"))
+    finally:
+        await client.close()
+        server.close()
+        await server.wait_closed()
+
+    assert clean == (False, "", 5)
+    assert infected == (True, "stream: Eicar-Test-Signature FOUND", 11)
+    assert len(connections) == 1
+
+
+@pytest.mark.asyncio
+async def test_scan_in_flight_cap_serializes_sessions():
+    """With a cap of one, concurrent scans queue up on a single session."""
+    connections = []
+    server = await _fake_clamd(connections)
+    port = server.sockets[0].getsockname()[1]
+    client = ScannerEngineClient(f"tcp://127.0.0.1:{port}", max_in_flight_scans=1)
+    try:
+        results = await asyncio.gather(
+            *(client.scan(InlineStreamProvider(b"data")) for _ in range(3))
+        )
+    finally:
+        await client.close()
+        server.close()
+        await server.wait_closed()
+
+    assert results == [(False, "", 4)] * 3
+    assert len(connections) == 1
+
+
+@pytest.mark.asyncio
+async def test_scan_streams_multi_chunk_body():
+    """Bodies larger than one chunk arrive intact across INSTREAM frames."""
+    connections = []
+    server = await _fake_clamd(connections)
+    port = server.sockets[0].getsockname()[1]
+    client = ScannerEngineClient(f"tcp://127.0.0.1:{port}")
+    data = b"x" * (2 * InlineStreamProvider.CHUNK_SIZE + 10) + b"EICAR"
+    try:
+        result = await client.scan(InlineStreamProvider(data))
+    finally:
+        await client.close()
+        server.close()
+        await server.wait_closed()
+
+    assert result == (True, "stream: Eicar-Test-Signature FOUND", len(data))
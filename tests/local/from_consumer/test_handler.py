@@ -1,14 +1,17 @@
 import asyncio
 import json
 import time
+from collections import deque
 from unittest.mock import AsyncMock
 
 import pytest
 import redis.asyncio as redis
 
+from aether_platform.virusscan.common import event_loop
 from aether_platform.virusscan.consumer.interfaces.worker.handler import \
     VirusScanHandler
 from aether_platform.virusscan.consumer.settings import Settings
+from support.fake_queue import FakeQueueProvider, QueueDrained
 
 
 @pytest.fixture
@@ -29,8 +32,8 @@ def settings():
 
 
 @pytest.fixture
-def mock_queue_provider():
-    return AsyncMock()
+def fake_queue_provider():
+    return FakeQueueProvider()
 
 
 @pytest.fixture
@@ -45,60 +48,240 @@ def mock_task_service():
 
 @pytest.mark.asyncio
 async def test_handler_loop_iteration(
-    mock_queue_provider, settings, mock_coordinator, mock_task_service
+    fake_queue_provider, settings, mock_coordinator, mock_task_service
 ):
     """Test one iteration of the handler loop"""
     handler = VirusScanHandler(
-        queue_provider=mock_queue_provider,
+        queue_provider=fake_queue_provider,
         settings=settings,
         coordinator=mock_coordinator,
         task_service=mock_task_service,
     )
 
-    class StopIter(BaseException):
-        pass
-
-    # Mock provider.pop to return a job and then raise StopIter to break the loop
     job_metadata = {
         "stream_id": "stream-123",
         "priority": "high",
         "enqueued_at": time.time() - 10,
     }
-    task_data_json = json.dumps(job_metadata)
-
-    # Use a side_effect function to handle concurrent workers
-    pop_calls = 0
-
-    async def side_effect(*args, **kwargs):
-        nonlocal pop_calls
-        pop_calls += 1
-        if pop_calls == 1:
-            return ("scan_priority", task_data_json.encode("utf-8"))
-        elif pop_calls == 2:
-            raise StopIter()
-        else:
-            # Other workers just wait or return None
-            await asyncio.sleep(0.1)
-            return None
-
-    mock_queue_provider.pop.side_effect = side_effect
-
-    try:
-        await handler.run()
-    except (StopIter, KeyboardInterrupt):
-        pass
+    task_data = json.dumps(job_metadata).encode("utf-8")
+    fake_queue_provider.queues["scan_priority"] = deque([task_data])
 
-    # Verify coordinator methods called
-    mock_coordinator.heartbeat.assert_called()
-    mock_coordinator.handle_sequential_update.assert_called()
+    # The first worker to find every queue empty ends the run
+    with pytest.raises(QueueDrained):
+        await handler.run()
 
-    # Verify task service called
-    mock_task_service.process_task.assert_called()
+    # Verify coordinator sync (heartbeat + reload check) called
+    mock_coordinator.sync_cluster_state.assert_called()
 
     # Check arguments: (task_data, queue_name, start_process_time=...)
-    # AsyncMock keeps track of call in call_args which has .args and .kwargs
     last_call = mock_task_service.process_task.call_args
-    assert last_call.args[0] == task_data_json
+    # Raw payload bytes are handed over; the service decodes JSON or msgpack
+    assert last_call.args[0] == task_data
     assert last_call.args[1] == "scan_priority"
-    assert "start_process_time" in last_call.kwargs
     assert isinstance(last_call.kwargs["start_process_time"], float)
+    assert fake_queue_provider.acked == [("scan_priority", task_data)]
+
+
+@pytest.mark.asyncio
+async def test_handler_pops_while_tasks_in_flight(
+    fake_queue_provider, settings, mock_coordinator, mock_task_service
+):
+    """Single-task pops still overlap: the loop pops again while tasks run."""
+    settings.pop_batch_size = 1
+    handler = VirusScanHandler(
+        queue_provider=fake_queue_provider,
+        settings=settings,
+        coordinator=mock_coordinator,
+        task_service=mock_task_service,
+    )
+    payloads = [f'{{"stream_id": "s{i}"}}'.encode() for i in range(3)]
+    fake_queue_provider.queues["scan_priority"] = deque(payloads)
+
+    started = []
+    release = asyncio.Event()
+
+    async def process_task(task_data, queue_name, start_process_time):
+        started.append(task_data)
+        if len(started) == len(payloads):
+            release.set()
+        await release.wait()
+
+    mock_task_service.process_task.side_effect = process_task
+
+    with pytest.raises(QueueDrained):
+        await asyncio.wait_for(handler._worker_loop("w", "scan_priority"), timeout=5)
+    # Serial dispatch would never set `release` and hit the timeout
+    await asyncio.wait_for(handler.drain(), timeout=5)
+
+    assert started == payloads
+    # Each task is confirmed to the queue once processed
+    assert sorted(fake_queue_provider.acked) == [("scan_priority", p) for p in payloads]
+
+
+@pytest.mark.asyncio
+async def test_handler_bounds_in_flight_tasks(
+    fake_queue_provider, settings, mock_coordinator, mock_task_service
+):
+    """No more than worker_concurrency tasks are dispatched at once."""
+    settings.worker_concurrency = 2
+    handler = VirusScanHandler(
+        queue_provider=fake_queue_provider,
+        settings=settings,
+        coordinator=mock_coordinator,
+        task_service=mock_task_service,
+    )
+    fake_queue_provider.queues["scan_priority"] = deque([b"{}"] * 6)
+
+    running = peak = 0
+
+    async def process_task(task_data, queue_name, start_process_time):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    mock_task_service.process_task.side_effect = process_task
+
+    with pytest.raises(QueueDrained):
+        await asyncio.wait_for(handler._worker_loop("w", "scan_priority"), timeout=5)
+    await handler.drain()
+
+    assert peak == 2
+    assert len(fake_queue_provider.acked) == 6
+
+
+@pytest.mark.asyncio
+async def test_handler_pop_count_follows_free_slots(
+    settings, mock_coordinator, mock_task_service
+):
+    """Slots held by other loops shrink the pop; unused reservations are returned."""
+    settings.worker_concurrency = 4
+    settings.pop_batch_size = 10
+    counts = []
+
+    async def pop_batch(queue_names, count, timeout=0):
+        counts.append(count)
+        if len(counts) > 1:
+            raise asyncio.CancelledError()
+        return []
+
+    provider = AsyncMock()
+    provider.pop_batch.side_effect = pop_batch
+    handler = VirusScanHandler(
+        queue_provider=provider,
+        settings=settings,
+        coordinator=mock_coordinator,
+        task_service=mock_task_service,
+    )
+    # Another worker loop holds three slots while it blocks in its own pop
+    for _ in range(3):
+        await handler._slots.acquire()
+
+    with pytest.raises(asyncio.CancelledError):
+        await handler._worker_loop("w", "scan_priority")
+
+    assert counts == [1, 1]
+    for _ in range(3):
+        handler._slots.release()
+    # Nothing leaked: every slot is free again
+    assert await handler._reserve_slots() == 4
+
+
+class _CountingTaskService:
+    """Plain task service stub; keeps the loop's own overhead measurable."""
+
+    def __init__(self):
+        self.processed = 0
+
+    def get_free_memory_mb(self) -> float:
+        return float("inf")
+
+    async def process_task(self, task_data, queue_name, start_process_time):
+        self.processed += 1
+
+
+class _CountingQueueProvider(FakeQueueProvider):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pops = 0
+
+    async def pop_batch(self, queue_names, count, timeout=0):
+        self.pops += 1
+        return await super().pop_batch(queue_names, count, timeout=timeout)
+
+
+@pytest.mark.asyncio
+async def test_handler_loop_pops_full_batches(settings, mock_coordinator):
+    """10k queued tasks drain with one pop round-trip per full batch."""
+    tasks = 10_000
+    settings.worker_concurrency = tasks
+    provider = _CountingQueueProvider({"scan_priority": [b"{}"] * tasks})
+    task_service = _CountingTaskService()
+    handler = VirusScanHandler(
+        queue_provider=provider,
+        settings=settings,
+        coordinator=mock_coordinator,
+        task_service=task_service,
+    )
+
+    with pytest.raises(QueueDrained):
+        await handler._worker_loop("w", "scan_priority")
+    await handler.drain()
+
+    assert task_service.processed == tasks
+    assert len(provider.acked) == tasks
+    # Plus the final pop that finds the queue empty
+    assert provider.pops == tasks // settings.pop_batch_size + 1
+
+
+@pytest.mark.asyncio
+async def test_coordination_loop_stops_on_shutdown(
+    settings, mock_coordinator, mock_task_service
+):
+    """Shutdown ends run() without sleeping out the heartbeat interval."""
+    settings.heartbeat_interval = 3600
+
+    async def idle_pop(*args, **kwargs):
+        await asyncio.sleep(0.01)
+        return []
+
+    provider = AsyncMock()
+    provider.pop_batch.side_effect = idle_pop
+    handler = VirusScanHandler(
+        queue_provider=provider,
+        settings=settings,
+        coordinator=mock_coordinator,
+        task_service=mock_task_service,
+    )
+    shutdown_event = asyncio.Event()
+    run = asyncio.create_task(handler.run(shutdown_event))
+    await asyncio.sleep(0.1)
+    shutdown_event.set()
+
+    await asyncio.wait_for(run, timeout=5)
+
+    mock_coordinator.sync_cluster_state.assert_awaited_once()
+
+
+def test_handler_drains_on_event_loop_runner(settings, mock_coordinator):
+    """The consumer's loop runner (uvloop when installed) drives the worker loop."""
+    provider = FakeQueueProvider({"scan_priority": [b"{}"] * 100})
+    task_service = _CountingTaskService()
+    handler = VirusScanHandler(
+        queue_provider=provider,
+        settings=settings,
+        coordinator=mock_coordinator,
+        task_service=task_service,
+    )
+
+    async def drain_queue():
+        try:
+            await handler._worker_loop("w", "scan_priority")
+        except QueueDrained:
+            pass
+        await handler.drain()
+
+    event_loop.run(drain_queue())
+
+    assert task_service.processed == 100
@@ -0,0 +1,40 @@
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+
+from aether_platform.virusscan.consumer.main import _with_health_fast_path
+
+
+@pytest.mark.asyncio
+async def test_health_answered_without_inner_app():
+    inner = AsyncMock()
+    send = AsyncMock()
+    scope = {"type": "http", "method": "GET", "path": "/health"}
+
+    await _with_health_fast_path(inner)(scope, None, send)
+
+    inner.assert_not_called()
+    start, body = (call.args[0] for call in send.await_args_list)
+    assert start["status"] == 200
+    assert json.loads(body["body"])["status"] == "ok"
+
+
+@pytest.mark.asyncio
+async def test_other_paths_reach_inner_app():
+    inner = AsyncMock()
+    scope = {"type": "http", "method": "GET", "path": "/metrics"}
+
+    await _with_health_fast_path(inner)(scope, None, None)
+
+    inner.assert_awaited_once_with(scope, None, None)
+
+
+@pytest.mark.asyncio
+async def test_non_get_health_reaches_inner_app():
+    inner = AsyncMock()
+    scope = {"type": "http", "method": "POST", "path": "/health"}
+
+    await _with_health_fast_path(inner)(scope, None, None)
+
+    inner.assert_awaited_once_with(scope, None, None)
@@ -0,0 +1,221 @@
+from unittest.mock import AsyncMock, MagicMock, call
+
+import pytest
+
+from aether_platform.virusscan.common.queue.provider import (
+    RedisQueueProvider, RedisSortedSetQueueProvider, RedisStreamQueueProvider)
+
+
+@pytest.fixture
+def mock_redis():
+    return AsyncMock()
+
+
+@pytest.mark.asyncio
+async def test_list_pop_batch_single_round_trip(mock_redis):
+    """BRPOP and the draining LMPOP go out in one pipeline execution."""
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(
+        return_value=[(b"scan_priority", b"a"), [b"scan_priority", [b"b", b"c"]]]
+    )
+    mock_redis.pipeline = MagicMock(return_value=pipe)
+    provider = RedisQueueProvider(mock_redis)
+
+    batch = await provider.pop_batch(["scan_priority", "scan_normal"], count=3, timeout=2)
+
+    pipe.brpop.assert_called_once_with(["scan_priority", "scan_normal"], timeout=2)
+    pipe.lmpop.assert_called_once_with(
+        2, "scan_priority", "scan_normal", direction="RIGHT", count=2
+    )
+    pipe.execute.assert_awaited_once()
+    assert batch == [
+        ("scan_priority", b"a"),
+        ("scan_priority", b"b"),
+        ("scan_priority", b"c"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_list_pop_batch_of_one_is_plain_brpop(mock_redis):
+    mock_redis.brpop.return_value = (b"scan_normal", b"a")
+    provider = RedisQueueProvider(mock_redis)
+
+    assert await provider.pop_batch(["scan_normal"], count=1, timeout=2) == [
+        ("scan_normal", b"a")
+    ]
+    mock_redis.pipeline.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_list_push_with_ttl_single_round_trip(mock_redis):
+    pipe = MagicMock()
+    pipe.execute = AsyncMock()
+    mock_redis.pipeline = MagicMock(return_value=pipe)
+    provider = RedisQueueProvider(mock_redis)
+
+    await provider.push_with_ttl("result:1", b"{}", 300)
+
+    pipe.lpush.assert_called_once_with("result:1", b"{}")
+    pipe.expire.assert_called_once_with("result:1", 300)
+    pipe.execute.assert_awaited_once()
+    mock_redis.lpush.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_zset_push_orders_by_queue_rank(mock_redis):
+    """Priority tasks score below every normal task."""
+    provider = RedisSortedSetQueueProvider(mock_redis)
+
+    await provider.push("scan_normal", b"normal")
+    await provider.push("scan_priority", b"priority")
+
+    (_, normal), _ = mock_redis.zadd.call_args_list[0]
+    (_, priority), _ = mock_redis.zadd.call_args_list[1]
+    assert priority[b"priority"] < normal[b"normal"]
+
+
+@pytest.mark.asyncio
+async def test_zset_pop_batch_maps_score_to_queue(mock_redis):
+    """BZMPOP results carry the logical queue name derived from the score."""
+    provider = RedisSortedSetQueueProvider(mock_redis)
+    stride = RedisSortedSetQueueProvider.RANK_STRIDE
+    mock_redis.bzmpop.return_value = [
+        b"scan_tasks",
+        [[b"a", b"1700000000000"], [b"b", str(stride + 1700000000000).encode()]],
+    ]
+
+    batch = await provider.pop_batch(["scan_priority", "scan_normal"], count=2, timeout=2)
+
+    mock_redis.bzmpop.assert_awaited_once_with(2, 1, ["scan_tasks"], min=True, count=2)
+    assert batch == [("scan_priority", b"a"), ("scan_normal", b"b")]
+
+
+@pytest.mark.asyncio
+async def test_zset_non_task_keys_stay_lists(mock_redis):
+    """ACK/result channels keep using list commands."""
+    provider = RedisSortedSetQueueProvider(mock_redis)
+    mock_redis.brpop.return_value = (b"ack:1", b"1")
+
+    await provider.push("ack:1", b"1")
+    assert await provider.pop(["ack:1"], timeout=5) == ("ack:1", b"1")
+
+    mock_redis.lpush.assert_awaited_once_with("ack:1", b"1")
+    mock_redis.zadd.assert_not_called()
+
+
+@pytest.fixture
+def stream_redis(mock_redis):
+    mock_redis.xautoclaim.return_value = [b"0-0", [], []]
+    pipe = MagicMock()
+    pipe.execute = AsyncMock()
+    mock_redis.pipeline = MagicMock(return_value=pipe)
+    return mock_redis
+
+
+@pytest.mark.asyncio
+async def test_stream_pop_batch_reads_group_in_priority_order(stream_redis):
+    """Streams are read highest priority first, each for what is still missing."""
+    stream_redis.xreadgroup.side_effect = [
+        [[b"scan_priority:stream", [(b"1-0", {b"d": b"a"})]]],
+        [[b"scan_normal:stream", [(b"2-0", {b"d": b"b"}), (b"2-1", {b"d": b"c"})]]],
+    ]
+    provider = RedisStreamQueueProvider(stream_redis, consumer="pod-1")
+
+    batch = await provider.pop_batch(["scan_priority", "scan_normal"], count=3, timeout=2)
+
+    assert batch == [("scan_priority", b"a"), ("scan_normal", b"b"), ("scan_normal", b"c")]
+    assert stream_redis.xgroup_create.await_count == 2
+    assert stream_redis.xreadgroup.await_args_list == [
+        call("scanners", "pod-1", {"scan_priority:stream": ">"}, count=3),
+        call("scanners", "pod-1", {"scan_normal:stream": ">"}, count=2),
+    ]
+
+    pipe = stream_redis.pipeline.return_value
+    await provider.ack("scan_normal", b"b")
+    pipe.xack.assert_called_once_with("scan_normal:stream", "scanners", b"2-0")
+    pipe.xdel.assert_called_once_with("scan_normal:stream", b"2-0")
+    pipe.execute.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_stream_pop_batch_stops_at_count(stream_redis):
+    """A full batch from the priority stream leaves the normal stream unread."""
+    stream_redis.xreadgroup.return_value = [
+        [b"scan_priority:stream", [(b"1-0", {b"d": b"a"}), (b"1-1", {b"d": b"b"})]]
+    ]
+    provider = RedisStreamQueueProvider(stream_redis, consumer="pod-1")
+
+    batch = await provider.pop_batch(["scan_priority", "scan_normal"], count=2)
+
+    assert len(batch) == 2
+    stream_redis.xreadgroup.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_stream_blocking_pop_requeues_surplus(stream_redis):
+    """When idle streams wake together, tasks beyond count go back to the group."""
+    stream_redis.xreadgroup.side_effect = [
+        [],
+        [],
+        [
+            [b"scan_priority:stream", [(b"1-0", {b"d": b"a"})]],
+            [b"scan_normal:stream", [(b"2-0", {b"d": b"b"})]],
+        ],
+    ]
+    provider = RedisStreamQueueProvider(stream_redis, consumer="pod-1")
+
+    batch = await provider.pop_batch(["scan_priority", "scan_normal"], count=1, timeout=2)
+
+    assert batch == [("scan_priority", b"a")]
+    assert stream_redis.xreadgroup.await_args_list[-1] == call(
+        "scanners",
+        "pod-1",
+        {"scan_priority:stream": ">", "scan_normal:stream": ">"},
+        count=1,
+        block=2000,
+    )
+    pipe = stream_redis.pipeline.return_value
+    pipe.xadd.assert_called_once_with("scan_normal:stream", {"d": b"b"})
+    pipe.xack.assert_called_once_with("scan_normal:stream", "scanners", b"2-0")
+    pipe.xdel.assert_called_once_with("scan_normal:stream", b"2-0")
+
+
+@pytest.mark.asyncio
+async def test_stream_stale_entries_are_redelivered(stream_redis):
+    """Entries of a dead consumer are claimed and handed out, not deleted."""
+    stream_redis.xautoclaim.side_effect = [
+        [b"0-0", [(b"1-0", {b"d": b"orphan"}), (b"1-1", None)], []],
+        [b"0-0", [], []],
+    ]
+    provider = RedisStreamQueueProvider(stream_redis, consumer="pod-1")
+
+    batch = await provider.pop_batch(["scan_priority", "scan_normal"], count=1)
+
+    assert batch == [("scan_priority", b"orphan")]
+    stream_redis.xautoclaim.assert_awaited_once_with(
+        "scan_priority:stream",
+        "scanners",
+        "pod-1",
+        RedisStreamQueueProvider.STALE_IDLE_MS,
+        count=1,
+    )
+    # Only the entry deleted from the stream meanwhile is acknowledged
+    stream_redis.xack.assert_awaited_once_with("scan_priority:stream", "scanners", b"1-1")
+    stream_redis.xreadgroup.assert_not_called()
+    stream_redis.pipeline.return_value.xdel.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_stream_push_and_non_task_keys(mock_redis):
+    """Task pushes become XADDs; ACK/result keys keep the list behaviour."""
+    provider = RedisStreamQueueProvider(mock_redis)
+
+    await provider.push("scan_priority", b"job")
+    mock_redis.xadd.assert_awaited_once_with("scan_priority:stream", {"d": b"job"})
+
+    await provider.push("ack:abc", b"1")
+    mock_redis.lpush.assert_awaited_once_with("ack:abc", b"1")
+
+    # Acking a payload that never came from a stream is a no-op
+    await provider.ack("ack:abc", b"1")
+    mock_redis.pipeline.assert_not_called()
@@ -0,0 +1,101 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from aether_platform.virusscan.consumer.infrastructure.result_publisher import \
+    RedisResultPublisher
+
+
+@pytest.fixture
+def mock_pipeline():
+    pipe = MagicMock()
+    pipe.execute = AsyncMock()
+    return pipe
+
+
+@pytest.fixture
+def mock_redis(mock_pipeline):
+    client = MagicMock()
+    client.pipeline = MagicMock(return_value=mock_pipeline)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_queued_results_share_one_pipeline(mock_redis, mock_pipeline):
+    publisher = RedisResultPublisher(mock_redis, channel="scan_results", ttl=300)
+
+    for i in range(5):
+        publisher.publish(f"t{i}", b"{}")
+    await publisher.close()
+
+    mock_pipeline.execute.assert_awaited_once()
+    assert mock_pipeline.lpush.call_count == 5
+    mock_pipeline.expire.assert_any_call("result:t0", 300)
+    stream, fields = mock_pipeline.xadd.call_args_list[0].args
+    assert stream == "scan_results"
+    assert fields == {"m": b"t0|{}"}
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_is_retried(mock_redis, mock_pipeline):
+    mock_pipeline.execute.side_effect = [ConnectionError("down"), None]
+    publisher = RedisResultPublisher(mock_redis)
+
+    publisher.publish("t1", b"{}")
+    await asyncio.wait_for(publisher.close(), timeout=5)
+
+    assert mock_pipeline.execute.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_recorded_keys_ride_the_result_pipeline(mock_redis, mock_pipeline):
+    """Samples share the result flush, and only the newest value per key is set."""
+    publisher = RedisResultPublisher(mock_redis)
+
+    publisher.publish("t1", b"{}")
+    publisher.record("tat_high_last", "10.0", 120)
+    publisher.record("tat_high_last", "20.0", 120)
+    await publisher.close()
+
+    mock_pipeline.execute.assert_awaited_once()
+    mock_pipeline.set.assert_called_once_with("tat_high_last", "20.0", ex=120)
+
+
+@pytest.mark.asyncio
+async def test_recorded_key_flushes_without_results(mock_redis, mock_pipeline):
+    publisher = RedisResultPublisher(mock_redis)
+
+    publisher.record("tat_normal_last", "5.0", 120)
+    await publisher.close()
+
+    mock_pipeline.set.assert_called_once_with("tat_normal_last", "5.0", ex=120)
+    mock_pipeline.lpush.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_flush_keeps_retrying_until_shutdown(
+    mock_redis, mock_pipeline, monkeypatch
+):
+    """An outage longer than the shutdown retry budget does not drop results."""
+    monkeypatch.setattr(RedisResultPublisher, "_MAX_BACKOFF", 0.0)
+    mock_pipeline.execute.side_effect = [ConnectionError("down")] * 5 + [None]
+    publisher = RedisResultPublisher(mock_redis)
+
+    publisher.publish("t1", b"{}")
+    while mock_pipeline.execute.await_count < 6:
+        await asyncio.sleep(0)
+    await asyncio.wait_for(publisher.close(), timeout=5)
+
+    assert mock_pipeline.execute.await_count == 6
+
+
+@pytest.mark.asyncio
+async def test_close_gives_up_on_unreachable_redis(mock_redis, mock_pipeline):
+    mock_pipeline.execute.side_effect = ConnectionError("down")
+    publisher = RedisResultPublisher(mock_redis)
+
+    publisher.publish("t1", b"{}")
+    await asyncio.wait_for(publisher.close(), timeout=5)
+
+    assert mock_pipeline.execute.await_count == RedisResultPublisher._RETRIES
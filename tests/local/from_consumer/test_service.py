@@ -1,12 +1,14 @@
 import json
+import threading
 import time
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from aether_platform.virusscan.consumer.application.service import \
     ScannerTaskService
 from aether_platform.virusscan.consumer.settings import Settings
+from aether_platform.virusscan.domain.models import TaskHeader
 
 
 @pytest.fixture
@@ -67,14 +69,14 @@ async def test_process_task_clean(
         "tenant_id": "test-tenant",
         "client_ip": "127.0.0.1",
     }
-    task_data = json.dumps(job_metadata)
+    task_data = json.dumps(job_metadata).encode("utf-8")
 
     # Mock provider
     mock_provider = MagicMock()
     mock_provider_factory.return_value = mock_provider
 
     # Mock engine
-    mock_engine.scan.return_value = (False, None)  # Clean
+    mock_engine.scan.return_value = (False, None, 0)  # Clean
 
     await task_service.process_task(
         task_data, "scan_normal", start_process_time=time.time()
@@ -84,12 +86,15 @@ async def test_process_task_clean(
     mock_engine.scan.assert_called_once_with(mock_provider)
     mock_provider_factory.assert_called_with("STREAM", chunks_key=task_id)
 
-    # Verify result pushed to Queue
-    mock_queue_provider.push.assert_called()
+    # Verify result pushed to Queue together with its TTL
+    mock_queue_provider.push_with_ttl.assert_called()
     # Check that a key like result:task-123 was pushed
     # The exact call order might vary, but we look for the result key
-    calls = mock_queue_provider.push.call_args_list
+    calls = mock_queue_provider.push_with_ttl.call_args_list
     result_call = next(c for c in calls if c.args[0] == f"result:{task_id}")
+    assert result_call.args[2] == 300
+    mock_queue_provider.push.assert_not_called()
+    mock_queue_provider.expire.assert_not_called()
     result_data = json.loads(result_call.args[1].decode("utf-8"))
     assert result_data["status"] == "CLEAN"
 
@@ -107,23 +112,103 @@ async def test_process_task_infected(
         "tenant_id": "test-tenant",
         "client_ip": "127.0.0.1",
     }
-    task_data = json.dumps(job_metadata)
+    task_data = json.dumps(job_metadata).encode("utf-8")
 
     # Mock provider
     mock_provider = MagicMock()
     mock_provider_factory.return_value = mock_provider
 
     # Mock engine
-    mock_engine.scan.return_value = (True, "Eicar-Test-Signature")  # Infected
+    mock_engine.scan.return_value = (True, "Eicar-Test-Signature", 68)  # Infected
 
     await task_service.process_task(
         task_data, "scan_normal", start_process_time=time.time()
     )
 
-    # Verify result pushed to Queue
-    mock_queue_provider.push.assert_called()
-    calls = mock_queue_provider.push.call_args_list
+    # Verify result pushed to Queue together with its TTL
+    mock_queue_provider.push_with_ttl.assert_called()
+    calls = mock_queue_provider.push_with_ttl.call_args_list
     result_call = next(c for c in calls if c.args[0] == f"result:{task_id}")
     result_data = json.loads(result_call.args[1].decode("utf-8"))
     assert result_data["status"] == "INFECTED"
     assert result_data["virus"] == "Eicar-Test-Signature"
+
+
+@pytest.mark.asyncio
+async def test_process_task_legacy_line(
+    task_service, mock_queue_provider, mock_engine, mock_provider_factory
+):
+    """The pipe-delimited task line is parsed from bytes and scanned."""
+    mock_engine.scan.return_value = (False, None, 0)
+
+    await task_service.process_task(
+        b"task-789|STREAM|1700000000000000000|chunks:task-789",
+        "scan_normal",
+        start_process_time=time.time(),
+    )
+
+    mock_provider_factory.assert_called_with("STREAM", chunks_key="chunks:task-789")
+    calls = mock_queue_provider.push_with_ttl.call_args_list
+    assert any(c.args[0] == "result:task-789" for c in calls)
+
+
+def test_task_header_parse():
+    """Both payload formats yield the same header fields."""
+    header = TaskHeader.parse(
+        json.dumps({"stream_id": "s1", "enqueued_at": 1.5, "tenant_id": "t"}).encode(),
+        default_enqueued_at=0.0,
+    )
+    assert header == TaskHeader("s1", 1.5, "s1", tenant_id="t")
+
+    legacy = TaskHeader.parse(b"s2|STREAM|2000000000|chunks:s2", default_enqueued_at=0.0)
+    assert (legacy.stream_id, legacy.enqueued_at, legacy.chunks_key) == (
+        "s2",
+        2.0,
+        "chunks:s2",
+    )
+
+    with pytest.raises(ValueError):
+        TaskHeader.parse(b'{"priority": "high"}', default_enqueued_at=0.0)
+
+
+@pytest.mark.asyncio
+async def test_process_task_records_labelled_metrics(task_service, mock_engine):
+    """Memoised metric children still land on the right label combination."""
+    from prometheus_client import REGISTRY
+
+    mock_engine.scan.return_value = (False, None, 2048)
+    labels = {"priority": "high", "result": "clean"}
+    before = REGISTRY.get_sample_value("scanner_scan_results_total", labels) or 0
+
+    for i in range(2):
+        await task_service.process_task(
+            json.dumps({"stream_id": f"metrics-{i}"}).encode(),
+            "scan_priority",
+            start_process_time=time.time(),
+        )
+
+    assert REGISTRY.get_sample_value("scanner_scan_results_total", labels) == before + 2
+
+
+@pytest.mark.asyncio
+async def test_process_task_decodes_large_payload_off_loop(
+    task_service, mock_queue_provider, mock_engine
+):
+    """A 64 KiB job decodes on the decode pool, not the event loop thread."""
+    mock_engine.scan.return_value = (False, None, 0)
+    payload = json.dumps({"stream_id": "big", "pad": "x" * 64 * 1024}).encode()
+    threads = []
+    real_parse = TaskHeader.parse
+
+    def recording_parse(*args, **kwargs):
+        threads.append(threading.current_thread())
+        return real_parse(*args, **kwargs)
+
+    with patch.object(TaskHeader, "parse", side_effect=recording_parse):
+        await task_service.process_task(
+            payload, "scan_normal", start_process_time=time.time()
+        )
+
+    assert threads and threads[0] is not threading.main_thread()
+    calls = mock_queue_provider.push_with_ttl.call_args_list
+    assert any(c.args[0] == "result:big" for c in calls)
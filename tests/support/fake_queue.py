@@ -0,0 +1,58 @@
+"""
+In-process stand-in for a QueueProvider backed by plain deques. Calls cost
+what a function call costs, so tests built on it double as rough hot-path
+benchmarks, which Mock-based providers cannot.
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from aether_platform.virusscan.common.queue.provider import QueueProvider
+
+
+class QueueDrained(BaseException):
+    """
+    Raised by a pop once every requested queue is empty. A BaseException, so
+    it escapes the worker loop's error handling and ends the test run.
+    """
+
+
+class FakeQueueProvider(QueueProvider):
+    def __init__(self, queues: Optional[Dict[str, Iterable[bytes]]] = None):
+        self.queues: Dict[str, deque] = {
+            name: deque(payloads) for name, payloads in (queues or {}).items()
+        }
+        self.pushed: List[Tuple[str, bytes | str]] = []
+        self.acked: List[Tuple[str, bytes]] = []
+        self.published: List[Tuple[str, bytes | str]] = []
+
+    async def push(self, queue_name: str, payload: bytes | str):
+        self.pushed.append((queue_name, payload))
+
+    async def pop(
+        self, queue_names: List[str], timeout: int = 0
+    ) -> Optional[Tuple[str, bytes]]:
+        batch = await self.pop_batch(queue_names, count=1, timeout=timeout)
+        return batch[0]
+
+    async def pop_batch(
+        self, queue_names: List[str], count: int, timeout: int = 0
+    ) -> List[Tuple[str, bytes]]:
+        batch = []
+        for name in queue_names:
+            pending = self.queues.get(name)
+            while pending and len(batch) < count:
+                batch.append((name, pending.popleft()))
+        if not batch:
+            raise QueueDrained()
+        return batch
+
+    async def ack(self, queue_name: str, payload: bytes):
+        self.acked.append((queue_name, payload))
+
+    async def push_with_ttl(self, queue_name: str, payload: bytes | str, ttl: int):
+        self.pushed.append((queue_name, payload))
+
+    async def publish(self, channel: str, message: bytes | str) -> Optional[bytes]:
+        self.published.append((channel, message))
+        return None
@@ -1,78 +1,106 @@
-import os
-import unittest
-import datetime
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
 from cryptography import x509
 from cryptography.x509.oid import NameOID
-from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import rsa
-
-# Mock paths - will be created during test
-CA_CERT_PATH = "/tmp/test_ca.crt"
-CA_KEY_PATH = "/tmp/test_ca.key"
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
 
+# Loads the generated Envoy protos sds.py builds on; needed when this module
+# runs without the integrated tests (which do the same) in its process
+from aether_platform.virusscan.producer import main as _producer_main  # noqa: F401
+from aether_platform.virusscan.producer.infrastructure.key_pool import LeafKeyPool
 from aether_platform.virusscan.producer.interfaces.grpc.sds import SecretDiscoveryHandler
+from aether_platform.virusscan.producer.settings import ProducerSettings
+
 
-class TestSDSGeneration(unittest.TestCase):
-
-    @classmethod
-    def setUpClass(cls):
-        # 1. Create a dummy Intermediate CA for testing
-        cls.ca_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
-        subject = issuer = x509.Name([
-            x509.NameAttribute(NameOID.COMMON_NAME, "test-intermediate-ca"),
-        ])
-        cls.ca_cert = x509.CertificateBuilder().subject_name(
-            subject
-        ).issuer_name(
-            issuer
-        ).public_key(
-            cls.ca_key.public_key()
-        ).serial_number(
-            x509.random_serial_number()
-        ).not_valid_before(
-            datetime.datetime.utcnow() - datetime.timedelta(days=1)
-        ).not_valid_after(
-            datetime.datetime.utcnow() + datetime.timedelta(days=1)
-        ).add_extension(
-            x509.BasicConstraints(ca=True, path_length=None), critical=True,
-        ).sign(cls.ca_key, hashes.SHA256())
-
-        with open(CA_CERT_PATH, "wb") as f:
-            f.write(cls.ca_cert.public_bytes(serialization.Encoding.PEM))
-        with open(CA_KEY_PATH, "wb") as f:
-            f.write(cls.ca_key.private_bytes(
-                encoding=serialization.Encoding.PEM,
-                format=serialization.PrivateFormat.TraditionalOpenSSL,
-                encryption_algorithm=serialization.NoEncryption()
-            ))
-
-    @classmethod
-    def tearDownClass(cls):
-        if os.path.exists(CA_CERT_PATH):
-            os.remove(CA_CERT_PATH)
-        if os.path.exists(CA_KEY_PATH):
-            os.remove(CA_KEY_PATH)
+class TestSDSGeneration:
+
+    @pytest.fixture(autouse=True)
+    def _ca(self, ca_paths):
+        # Session-scoped CA from conftest; generated once per worker
+        self.ca_cert_path, self.ca_key_path = ca_paths
 
     def test_cert_generation(self):
-        handler = SecretDiscoveryHandler(CA_CERT_PATH, CA_KEY_PATH)
+        handler = SecretDiscoveryHandler(self.ca_cert_path, self.ca_key_path)
         target_domain = "www.google.com"
         
         cert_pem, key_pem, chain_pem = handler._generate_cert(target_domain)
         
         # Verify cert_pem
         cert = x509.load_pem_x509_certificate(cert_pem)
-        self.assertEqual(cert.subject.get_attributes_for_oid(NameOID.COMMON_NAME)[0].value, target_domain)
+        assert cert.subject.get_attributes_for_oid(NameOID.COMMON_NAME)[0].value == target_domain
         
         # Verify Issuer (must match our test CA)
-        self.assertEqual(cert.issuer.get_attributes_for_oid(NameOID.COMMON_NAME)[0].value, "test-intermediate-ca")
+        assert cert.issuer.get_attributes_for_oid(NameOID.COMMON_NAME)[0].value == "test-intermediate-ca"
         
         # Verify SAN
         san = cert.extensions.get_extension_for_class(x509.SubjectAlternativeName)
-        self.assertIn(target_domain, [name.value for name in san.value])
+        assert target_domain in [name.value for name in san.value]
         
         # Verify Private Key
         key = serialization.load_pem_private_key(key_pem, password=None)
-        self.assertIsInstance(key, rsa.RSAPrivateKey)
+        assert isinstance(key, ec.EllipticCurvePrivateKey)
+        assert isinstance(key.curve, ec.SECP256R1)
+
+    def test_cert_generation_rsa_legacy(self):
+        handler = SecretDiscoveryHandler(self.ca_cert_path, self.ca_key_path, key_algo="rsa")
+        _, key_pem, _ = handler._generate_cert("legacy.example.com")
+
+        key = serialization.load_pem_private_key(key_pem, password=None)
+        assert isinstance(key, rsa.RSAPrivateKey)
+
+    def test_resolve_secret_single_flight(self):
+        handler = SecretDiscoveryHandler(self.ca_cert_path, self.ca_key_path)
+
+        async def resolve_concurrently():
+            return await asyncio.gather(
+                *(handler._resolve_secret("burst.example.com") for _ in range(5))
+            )
+
+        with patch.object(
+            handler, "_new_leaf_key", wraps=handler._new_leaf_key
+        ) as new_leaf_key:
+            resources = asyncio.run(resolve_concurrently())
+
+        assert new_leaf_key.call_count == 1
+        assert len(resources) == 5
+        first, _, _ = handler._generate_cert("burst.example.com")
+        again, _, _ = handler._generate_cert("burst.example.com")
+        assert first is again
+
+    def test_cert_generation_uses_key_pool(self):
+        pool = LeafKeyPool(size=2, workers=1)
+        try:
+            # Wait for the worker process to pre-generate the keys
+            deadline = time.monotonic() + 60
+            while len(pool) < 2 and time.monotonic() < deadline:
+                time.sleep(0.05)
+            assert len(pool) == 2
+
+            handler = SecretDiscoveryHandler(
+                self.ca_cert_path, self.ca_key_path, key_pool=pool, key_algo="rsa"
+            )
+            cert_pem, key_pem, _ = handler._generate_cert("pooled.example.com")
+            assert len(pool) == 1
+
+            cert = x509.load_pem_x509_certificate(cert_pem)
+            key = serialization.load_pem_private_key(key_pem, password=None)
+            assert (
+                cert.public_key().public_numbers() == key.public_key().public_numbers()
+            )
+        finally:
+            pool.close()
+
+
+def test_key_pool_settings_split_cpus_between_workers(monkeypatch):
+    monkeypatch.setattr("os.cpu_count", lambda: 8)
+    monkeypatch.setenv("SDS_KEY_POOL_SIZE", "not-a-number")
+
+    settings = ProducerSettings(producer_workers=4)
 
-if __name__ == "__main__":
-    unittest.main()
+    # A bad value falls back to the default instead of failing at startup
+    assert settings.sds_key_pool_size == 32
+    assert settings.sds_key_pool_workers == 2
@@ -1,5 +1,5 @@
 import hashlib
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -9,12 +9,14 @@ from aether_platform.intelligent_cache.application.service import \
 
 @pytest.fixture
 def mock_provider():
-    return MagicMock()
+    return AsyncMock()
 
 
 @pytest.fixture
 def mock_policy():
-    return MagicMock()
+    policy = MagicMock()
+    policy.should_bypass.return_value = False
+    return policy
 
 
 @pytest.fixture
@@ -22,42 +24,102 @@ def service(mock_provider, mock_policy):
     return IntelligentCacheService(mock_provider, mock_policy)
 
 
-def test_check_cache_hit(service, mock_provider):
+@pytest.mark.asyncio
+async def test_check_cache_hit(service, mock_provider):
     uri = "http://example.com/clean_file.zip"
-    expected_hash = hashlib.sha256(uri.encode()).hexdigest()
-    expected_key = f"aether:cache:uri:{expected_hash}"
+    expected_key = b"aether:c:" + hashlib.sha256(uri.encode()).digest()[:16]
 
     # Setup mock to simulate cache hit
     mock_provider.exists.return_value = True
 
-    assert service.check_cache(uri) is True
-    mock_provider.exists.assert_called_once_with(expected_key)
+    assert await service.check_cache(uri) is True
+    mock_provider.exists.assert_awaited_once_with(expected_key)
 
 
-def test_check_cache_miss(service, mock_provider):
+@pytest.mark.asyncio
+async def test_check_cache_miss(service, mock_provider):
     uri = "http://example.com/new_file.zip"
 
     # Setup mock to simulate cache miss
     mock_provider.exists.return_value = False
 
-    assert service.check_cache(uri) is False
+    assert await service.check_cache(uri) is False
 
 
-def test_store_cache(service, mock_provider):
+@pytest.mark.asyncio
+async def test_store_cache(service, mock_provider):
     uri = "http://example.com/clean_file.zip"
-    expected_hash = hashlib.sha256(uri.encode()).hexdigest()
-    expected_key = f"aether:cache:uri:{expected_hash}"
+    expected_key = b"aether:c:" + hashlib.sha256(uri.encode()).digest()[:16]
 
-    service.store_cache(uri)
+    await service.store_cache(uri)
 
-    mock_provider.set.assert_called_once_with(expected_key, "1", ex=3600)
+    mock_provider.set.assert_awaited_once_with(expected_key, "1", ex=3600)
 
 
-def test_store_cache_custom_ttl(service, mock_provider):
+@pytest.mark.asyncio
+async def test_store_cache_custom_ttl(service, mock_provider):
     uri = "http://example.com/clean_file.zip"
-    expected_hash = hashlib.sha256(uri.encode()).hexdigest()
-    expected_key = f"aether:cache:uri:{expected_hash}"
+    expected_key = b"aether:c:" + hashlib.sha256(uri.encode()).digest()[:16]
 
-    service.store_cache(uri, ttl=7200)
+    await service.store_cache(uri, ttl=7200)
 
-    mock_provider.set.assert_called_once_with(expected_key, "1", ex=7200)
+    mock_provider.set.assert_awaited_once_with(expected_key, "1", ex=7200)
+
+
+@pytest.mark.asyncio
+async def test_lookup_single_mget(service, mock_provider):
+    uri = "http://example.com/clean_file.zip"
+    digest = hashlib.sha256(uri.encode())
+    mock_provider.mget.return_value = [None, b"1"]
+
+    assert await service.lookup(uri) == (None, True)
+    mock_provider.mget.assert_awaited_once_with(
+        f"aether:infected:uri:{digest.hexdigest()}", b"aether:c:" + digest.digest()[:16]
+    )
+    mock_provider.exists.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_lookup_served_locally_after_second_hit(service, mock_provider):
+    uri = "http://example.com/hot_file.zip"
+    mock_provider.mget.return_value = [None, b"1"]
+
+    # First hit only passes the doorkeeper, the second admits the verdict
+    for _ in range(3):
+        assert await service.lookup(uri) == (None, True)
+    assert mock_provider.mget.await_count == 2
+
+    # A new infected verdict evicts the local clean entry
+    await service.store_infected(uri, "Eicar")
+    mock_provider.mget.return_value = [b"Eicar", None]
+    assert await service.lookup(uri) == (b"Eicar", False)
+
+
+@pytest.mark.asyncio
+async def test_cache_key_digest_memoised(service, mock_provider):
+    """Repeated URIs reuse the derived key instead of hashing again."""
+    uri = "http://example.com/memoised.tar.gz"
+    with patch(
+        "aether_platform.intelligent_cache.application.service.hashlib.sha256",
+        wraps=hashlib.sha256,
+    ) as sha256:
+        await service.check_cache(uri)
+        await service.store_cache(uri)
+
+    assert sha256.call_count == 1
+    assert mock_provider.exists.call_args.args[0] == mock_provider.set.call_args.args[0]
+
+
+@pytest.mark.asyncio
+async def test_lookup_hashes_uri_once(service, mock_provider):
+    """The clean and infected keys come from a single SHA-256 of the URI."""
+    uri = "http://example.com/both_keys.bin"
+    mock_provider.mget.return_value = [None, None]
+    with patch(
+        "aether_platform.intelligent_cache.application.service.hashlib.sha256",
+        wraps=hashlib.sha256,
+    ) as sha256:
+        await service.lookup(uri)
+        await service.store_infected(uri, "Eicar")
+
+    assert sha256.call_count == 1
@@ -0,0 +1,17 @@
+import pytest
+
+from aether_platform.virusscan.common.providers import InlineStreamProvider
+
+
+@pytest.mark.asyncio
+async def test_pushed_chunks_are_read_back_in_order():
+    provider = InlineStreamProvider(b"head-")
+    for part in (b"a" * 10, b"b" * InlineStreamProvider.CHUNK_SIZE, b"-tail"):
+        await provider.push_chunk(part)
+    await provider.finalize_push()
+
+    chunks = [bytes(chunk) async for chunk in provider.get_chunks()]
+
+    expected = b"head-" + b"a" * 10 + b"b" * InlineStreamProvider.CHUNK_SIZE + b"-tail"
+    assert b"".join(chunks) == expected
+    assert provider.data == expected
@@ -0,0 +1,16 @@
+from unittest.mock import AsyncMock, MagicMock
+
+from aether_platform.virusscan.producer.application.orchestrator import \
+    ScanOrchestrator
+
+
+def test_prepare_session_drops_expired_sessions():
+    orchestrator = ScanOrchestrator(
+        redis_adapter=AsyncMock(), provider_factory=MagicMock()
+    )
+    stale_id, _ = orchestrator.prepare_session()
+    orchestrator._start_times[stale_id]["start_ns"] -= orchestrator._SESSION_TTL_NS
+
+    live_id, _ = orchestrator.prepare_session()
+
+    assert list(orchestrator._start_times) == [live_id]
@@ -0,0 +1,123 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+
+from aether_platform.virusscan.producer.infrastructure.redis_adapter import \
+    RedisScanAdapter
+
+
+@pytest.fixture
+def mock_state_store():
+    return AsyncMock()
+
+
+@pytest.fixture
+def adapter(mock_state_store):
+    return RedisScanAdapter(queue_provider=AsyncMock(), state_store=mock_state_store)
+
+
+@pytest.mark.asyncio
+async def test_get_last_tat_cached_briefly(adapter, mock_state_store):
+    mock_state_store.get.return_value = b"1500"
+
+    assert await adapter.get_last_tat(True) == 1.5
+    assert await adapter.get_last_tat(True) == 1.5
+    mock_state_store.get.assert_awaited_once_with("tat_high_last")
+
+    # Priorities are cached independently
+    await adapter.get_last_tat(False)
+    mock_state_store.get.assert_awaited_with("tat_normal_last")
+
+
+@pytest.mark.asyncio
+async def test_enqueue_task_pushes_json_bytes(adapter):
+    await adapter.enqueue_task("task-1", "STREAM", 2_000_000_000, "tenant", True)
+
+    queue_name, payload = adapter.provider.push.await_args.args
+    assert queue_name == "scan_priority"
+    assert isinstance(payload, bytes)
+    job = json.loads(payload)
+    assert job["stream_id"] == "task-1"
+    assert job["enqueued_at"] == 2.0
+
+
+@pytest.mark.asyncio
+async def test_blocking_waits_use_wait_provider(mock_state_store):
+    queue_provider = AsyncMock()
+    wait_provider = AsyncMock()
+    wait_provider.pop.return_value = ("ack:task-1", b"1")
+    adapter = RedisScanAdapter(
+        queue_provider=queue_provider,
+        state_store=mock_state_store,
+        wait_provider=wait_provider,
+    )
+
+    assert await adapter.wait_for_ack("task-1", timeout=5) is True
+    wait_provider.pop.assert_awaited_once_with(["ack:task-1"], timeout=5)
+    queue_provider.pop.assert_not_called()
+
+
+async def _fake_redis(ack_delays: dict):
+    """Minimal RESP server: BRPOP on ack:<id> answers after ack_delays[<id>]."""
+
+    async def read_command(reader):
+        count = int((await reader.readline())[1:])
+        args = []
+        for _ in range(count):
+            size = int((await reader.readline())[1:])
+            args.append((await reader.readexactly(size + 2))[:-2])
+        return args
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                args = await read_command(reader)
+                if args[0].upper() == b"BRPOP":
+                    key = args[1]
+                    await asyncio.sleep(ack_delays[key.decode()[len("ack:"):]])
+                    writer.write(b"*2\r\n$%d\r\n%s\r\n$1\r\n1\r\n" % (len(key), key))
+                elif args[0].upper() == b"PING":
+                    writer.write(b"+PONG\r\n")
+                else:
+                    writer.write(b"+OK\r\n")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            writer.close()
+
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+
+@pytest.mark.asyncio
+async def test_saturated_wait_pool_delays_handshake_without_bypass():
+    """More concurrent handshakes than wait connections queue; none fails."""
+    # Container wiring needs the generated Envoy protos loaded first
+    from aether_platform.virusscan.producer import main  # noqa: F401
+    from aether_platform.virusscan.producer.containers import ProducerContainer
+
+    server = await _fake_redis({"slow": 0.3, "fast": 0})
+    container = ProducerContainer()
+    container.config.from_dict(
+        {
+            "redis_host": "127.0.0.1",
+            "redis_port": server.sockets[0].getsockname()[1],
+            "redis_wait_max_connections": 1,
+        }
+    )
+    pool = container.redis_blocking_pool()
+    orchestrator = container.orchestrator()
+    try:
+        slow = asyncio.create_task(orchestrator.await_handshake("slow", timeout=5))
+        await asyncio.sleep(0.05)
+        fast = await orchestrator.await_handshake("fast", timeout=5)
+        assert await slow is True
+    finally:
+        await pool.disconnect()
+        server.close()
+        await server.wait_closed()
+
+    # The fast handshake waited for the only connection instead of failing
+    assert fast is True
+    assert pool.max_connections == 1
+    assert pool.timeout is None
@@ -0,0 +1,46 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from aether_platform.virusscan.common.providers import RedisStreamProvider
+
+
+@pytest.fixture
+def mock_pipeline():
+    pipe = MagicMock()
+    pipe.execute = AsyncMock()
+    return pipe
+
+
+@pytest.fixture
+def mock_redis(mock_pipeline):
+    client = AsyncMock()
+    client.pipeline = MagicMock(return_value=mock_pipeline)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_push_chunk_batches_rpush(mock_redis, mock_pipeline):
+    provider = RedisStreamProvider(mock_redis, "task-1", batch_chunks=2)
+
+    await provider.push_chunk(b"a")
+    mock_redis.rpush.assert_not_called()
+    await provider.push_chunk(b"b")
+    mock_redis.rpush.assert_awaited_once_with("task-1", b"a", b"b")
+
+    await provider.push_chunk(b"c")
+    await provider.finalize_push()
+
+    # Tail chunk and done marker share one pipeline round-trip
+    mock_pipeline.rpush.assert_called_once_with("task-1", b"c")
+    mock_pipeline.set.assert_called_once_with("task-1:done", "1")
+    mock_pipeline.execute.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_push_chunk_flushes_on_bytes(mock_redis):
+    provider = RedisStreamProvider(mock_redis, "task-2", batch_bytes=4)
+
+    await provider.push_chunk(b"12345")
+
+    mock_redis.rpush.assert_awaited_once_with("task-2", b"12345")
@@ -0,0 +1,66 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from aether_platform.virusscan.producer.infrastructure.result_listener import \
+    RedisResultListener
+
+
+class FakeStream:
+    """Serves XREAD from an asyncio queue of (entry_id, payload) pairs."""
+
+    def __init__(self):
+        self.entries = asyncio.Queue()
+        self.reads = []
+
+    async def xrevrange(self, name, count=None):
+        return [(b"5-0", {b"m": b"old|{}"})]
+
+    async def xread(self, streams, count=None, block=None):
+        self.reads.append(dict(streams))
+        batch = [await self.entries.get()]
+        while not self.entries.empty() and len(batch) < count:
+            batch.append(self.entries.get_nowait())
+        name = next(iter(streams))
+        return [[name, [(entry_id, {b"m": data}) for entry_id, data in batch]]]
+
+
+@pytest.fixture
+def stream():
+    return FakeStream()
+
+
+@pytest.fixture
+def mock_redis(stream):
+    client = MagicMock()
+    client.xrevrange = stream.xrevrange
+    client.xread = stream.xread
+    client.rpop = AsyncMock(return_value=None)
+    client.brpop = AsyncMock(return_value=None)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_wait_resolves_from_stream(mock_redis, stream):
+    listener = RedisResultListener(mock_redis, channel="scan_results")
+    waiting = asyncio.create_task(listener.wait("t1", "result:t1", timeout=5))
+    await asyncio.sleep(0)
+    await stream.entries.put((b"6-0", b"other|{}"))
+    await stream.entries.put((b"7-0", b't1|{"status": "CLEAN"}'))
+
+    assert await waiting == b'{"status": "CLEAN"}'
+    # Reading starts after the newest existing entry
+    assert stream.reads[0] == {"scan_results": b"5-0"}
+    mock_redis.brpop.assert_not_called()
+    await listener.close()
+
+
+@pytest.mark.asyncio
+async def test_wait_returns_result_appended_before_start(mock_redis):
+    mock_redis.rpop.return_value = b'{"status": "INFECTED"}'
+    listener = RedisResultListener(mock_redis)
+
+    assert await listener.wait("t2", "result:t2", timeout=5) == b'{"status": "INFECTED"}'
+    mock_redis.rpop.assert_awaited_once_with("result:t2")
+    await listener.close()
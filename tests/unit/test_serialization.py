@@ -0,0 +1,22 @@
+import json
+
+import pytest
+
+from aether_platform.virusscan.common import serialization
+
+
+def test_json_round_trip_from_bytes():
+    payload = serialization.dumps({"stream_id": "t1", "enqueued_at": 1.5})
+
+    assert isinstance(payload, bytes)
+    assert json.loads(payload) == {"stream_id": "t1", "enqueued_at": 1.5}
+    assert serialization.loads(payload) == {"stream_id": "t1", "enqueued_at": 1.5}
+
+
+def test_msgpack_round_trip_is_detected():
+    msgpack = pytest.importorskip("msgpack")
+    payload = serialization.dumps({"stream_id": "t1"}, serialization.MSGPACK)
+
+    assert payload == msgpack.packb({"stream_id": "t1"}, use_bin_type=True)
+    # Readers need no codec setting: the first byte tells the formats apart
+    assert serialization.loads(payload) == {"stream_id": "t1"}
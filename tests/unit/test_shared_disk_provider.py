@@ -0,0 +1,17 @@
+import pytest
+
+from aether_platform.virusscan.common.providers import SharedDiskStreamProvider
+
+
+@pytest.mark.asyncio
+async def test_round_trip_in_chunk_size_reads(tmp_path):
+    provider = SharedDiskStreamProvider(str(tmp_path / "body"))
+    data = bytes(range(256)) * (SharedDiskStreamProvider.CHUNK_SIZE // 128 + 1)
+    await provider.push_chunk(data[:1000])
+    await provider.push_chunk(data[1000:])
+    await provider.finalize_push()
+
+    chunks = [chunk async for chunk in provider.get_chunks()]
+
+    assert b"".join(chunks) == data
+    assert [len(c) for c in chunks[:-1]] == [SharedDiskStreamProvider.CHUNK_SIZE] * 2